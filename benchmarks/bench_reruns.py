@@ -0,0 +1,212 @@
+"""Rerun latency and memory benchmarks for both dashboards.
+
+Each (app, scale) pair runs in its own subprocess against a fresh synthetic database, driven
+headlessly by Streamlit's AppTest harness. For every pair the benchmark records the cold first
+run, the wall time of repeated widget-triggered reruns, and the allocations and peak traced
+memory of a rerun, then writes everything to a JSON file.
+
+Usage:
+    python benchmarks/bench_reruns.py
+    python benchmarks/bench_reruns.py --scales 12 1000 --reruns 10 --output bench.json
+    python benchmarks/bench_reruns.py --compare benchmarks/baseline.json --tolerance 0.25
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+APPS = {
+    'innovation': 'innovation_analysis_comparison.py',
+    'plant': 'plant_health_check.py',
+}
+
+DEFAULT_SCALES = [12, 1_000, 100_000]
+
+
+def seed_database(app, scale, db_path):
+    # Fill a fresh database with `scale` synthetic innovations (innovation app) or
+    # productivity improvements and action items (plant app)
+    from innovation_metrics import INPUT_COLUMNS
+    from innovation_schema import DEFAULT_RECORD, STATUS_OPTIONS, TECHNOLOGY_TYPES
+    from persistence import DataStore
+
+    rng = random.Random(scale)
+    db = DataStore(db_path)
+    if app == 'innovation':
+        records = []
+        for number in range(1, scale + 1):
+            record = dict(DEFAULT_RECORD)
+            record.update({column: round(rng.uniform(1, 1_000_000), 2) for column in INPUT_COLUMNS})
+            record['Plant'] = f"Plant {number % 20}"
+            record['Status'] = rng.choice(STATUS_OPTIONS)
+            record['Technology Type'] = rng.choice(TECHNOLOGY_TYPES)
+            records.append((f"Innovation {number}", record))
+        db.append_many('innovation_inputs', records)
+    else:
+        statuses = ['Open', 'In Progress', 'Completed']
+        today = date.today()
+        db.append_many('productivity_improvements', [
+            (f"entry-{number}", {
+                'Training Needs': f"Training {number}",
+                'Suggested Workflow Changes': f"Change {number}",
+                'Due Date': today + timedelta(days=rng.randint(-30, 60)),
+                'Assigned User': f"User {number % 50}",
+                'Status': rng.choice(statuses),
+            }) for number in range(scale)])
+        db.append_many('action_items', [
+            (number, {
+                'Action Item': f"Action {number}",
+                'Assigned To': f"Owner {number % 50}",
+                'Due Date': today + timedelta(days=rng.randint(-30, 60)),
+                'Status': rng.choice(statuses),
+                'Projected Benefit': f"Benefit {number}",
+            }) for number in range(scale)])
+    db.close()
+
+
+def interact(app, at):
+    # One widget change that triggers a full-script rerun, as a user edit would
+    if app == 'innovation':
+        # Inputs are batched in a form: edit a field, then submit it
+        widget = at.number_input(key=f"{at.sidebar.selectbox[0].value}_SalesAfter")
+        widget.set_value(widget.value + 1)
+        next(button for button in at.button if button.label == "Save Inputs").click().run()
+    else:
+        widget = at.text_area[0]
+        widget.set_value(widget.value + ".").run()
+
+
+def run_child(app, scale, reruns):
+    # Measure one (app, scale) pair; called in a subprocess with INNOVATION_APP_DB already set
+    from streamlit.testing.v1 import AppTest
+
+    seed_start = time.perf_counter()
+    seed_database(app, scale, os.environ['INNOVATION_APP_DB'])
+    seed_seconds = time.perf_counter() - seed_start
+
+    at = AppTest.from_file(os.path.join(REPO_ROOT, APPS[app]), default_timeout=3600)
+    start = time.perf_counter()
+    at.run()
+    cold_seconds = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(f"{APPS[app]} raised: {at.exception[0].message}")
+    if app == 'innovation':
+        # Exercise the comparison path on every rerun: pick a full page of ideas in the paged
+        # comparison picker, the widget whose cost used to grow with the number of ideas
+        picker = at.sidebar.multiselect[-1]
+        for idea in picker.options:
+            picker.select(idea)
+        at.run()
+
+    timings = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        interact(app, at)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    interact(app, at)
+    after = tracemalloc.take_snapshot()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    allocated = [stat for stat in after.compare_to(before, 'filename') if stat.size_diff > 0]
+
+    timings.sort()
+    return {
+        'app': app,
+        'scale': scale,
+        'seed_seconds': seed_seconds,
+        'cold_run_seconds': cold_seconds,
+        'reruns': reruns,
+        'rerun_seconds_median': statistics.median(timings),
+        'rerun_seconds_p95': timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        'rerun_seconds_max': timings[-1],
+        'rerun_peak_traced_bytes': peak_bytes,
+        'rerun_retained_bytes': sum(stat.size_diff for stat in allocated),
+        'rerun_retained_blocks': sum(stat.count_diff for stat in allocated),
+        'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def run_pair(app, scale, reruns):
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, INNOVATION_APP_DB=os.path.join(tmp, 'bench.db'))
+        env.pop('PLANT_TELEMETRY_PATH', None)
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--child', app, str(scale), str(reruns)],
+            cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        return {'app': app, 'scale': scale, 'error': completed.stderr.strip().splitlines()[-1:]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def compare(results, baseline_path, tolerance):
+    # Regressions: median rerun time or peak memory above the baseline by more than `tolerance`
+    with open(baseline_path) as f:
+        baseline = {(r['app'], r['scale']): r for r in json.load(f)['results'] if 'error' not in r}
+    regressions = []
+    for result in results:
+        base = baseline.get((result['app'], result['scale']))
+        if base is None or 'error' in result:
+            continue
+        for key in ('rerun_seconds_median', 'rerun_peak_traced_bytes'):
+            if base[key] and result[key] > base[key] * (1 + tolerance):
+                regressions.append(f"{result['app']} @ {result['scale']}: {key} {base[key]:.4g} -> {result[key]:.4g}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark rerun latency and memory of both dashboards.")
+    parser.add_argument('--apps', nargs='+', choices=sorted(APPS), default=sorted(APPS))
+    parser.add_argument('--scales', nargs='+', type=int, default=DEFAULT_SCALES)
+    parser.add_argument('--reruns', type=int, default=5, help="Timed reruns per app and scale (default: 5)")
+    parser.add_argument('--output', default=os.path.join(REPO_ROOT, 'benchmarks', 'results.json'))
+    parser.add_argument('--compare', help="Baseline results file; exit non-zero on regressions")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed relative slowdown (default: 0.25)")
+    parser.add_argument('--child', nargs=3, metavar=('APP', 'SCALE', 'RERUNS'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        sys.path.insert(0, REPO_ROOT)
+        app, scale, reruns = args.child
+        print(json.dumps(run_child(app, int(scale), int(reruns))))
+        return 0
+
+    results = []
+    for app in args.apps:
+        for scale in args.scales:
+            result = run_pair(app, scale, args.reruns)
+            results.append(result)
+            if 'error' in result:
+                print(f"{app:<11} {scale:>8}  ERROR {result['error']}", file=sys.stderr)
+            else:
+                print(f"{app:<11} {scale:>8}  cold {result['cold_run_seconds']:.3f}s  "
+                      f"rerun median {result['rerun_seconds_median']:.3f}s  "
+                      f"peak {result['rerun_peak_traced_bytes'] / 1e6:.1f} MB", file=sys.stderr)
+
+    with open(args.output, 'w') as f:
+        json.dump({'python': platform.python_version(), 'platform': platform.platform(),
+                   'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'results': results}, f, indent=2)
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 1 if any('error' in result for result in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,52 @@
+import hashlib
+import io
+import pickle
+import threading
+from collections import OrderedDict
+
+from matplotlib.figure import Figure
+
+
+class ChartCache:
+    # LRU cache of rendered chart images keyed by the drawing function and the data it plots.
+    # Figures are built with matplotlib.figure.Figure instead of pyplot, so they are never
+    # registered with pyplot's global figure manager; a single figure is reused for every
+    # render and cleared afterwards, keeping memory flat in long-lived server processes.
+
+    def __init__(self, max_entries=256, dpi=100):
+        self.max_entries = max_entries
+        self.dpi = dpi
+        self.hits = 0
+        self.misses = 0
+        self._images = OrderedDict()
+        self._figure = Figure()
+        self._lock = threading.Lock()
+
+    def render(self, draw, *data):
+        # PNG bytes of `draw(ax, *data)`, rendered only when this data has not been drawn before
+        key = hashlib.blake2b(pickle.dumps((draw.__module__, draw.__qualname__, data)), digest_size=16).hexdigest()
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+                self.hits += 1
+                return image
+
+            self.misses += 1
+            ax = self._figure.subplots()
+            try:
+                draw(ax, *data)
+                buffer = io.BytesIO()
+                self._figure.savefig(buffer, format='png', dpi=self.dpi, bbox_inches='tight')
+                image = buffer.getvalue()
+            finally:
+                self._figure.clear()
+
+            self._images[key] = image
+            while len(self._images) > self.max_entries:
+                self._images.popitem(last=False)
+            return image
+
+    def clear(self):
+        with self._lock:
+            self._images.clear()
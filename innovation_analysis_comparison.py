@@ -1,40 +1,128 @@
+import io
+import uuid
+
+import pyarrow.parquet as pq
 import streamlit as st
-import pandas as pd
+
+from chart_cache import ChartCache
+from innovation_metrics import METRIC_COLUMNS, format_critical_conditions
+from innovation_schema import (DEFAULT_RECORD, STATUS_OPTIONS, TECHNOLOGY_TYPES, YES_NO, apply_schema, to_arrow,
+                               validate_records)
+from innovation_store import INDEXED_COLUMNS, InnovationStore, page, page_count
+from instrumentation import RerunTimer, exporters_from_environment, span
+from metrics_cache import MetricsCache
+from persistence import DataStore
+from portfolio import monte_carlo, rank_portfolio
+
+# Per-section timing of every script run, exported when APP_METRICS_FILE / APP_METRICS_PORT is set
+@st.cache_resource
+def get_metrics_exporters():
+    return exporters_from_environment()
+
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+timer = RerunTimer('innovation', st.session_state.session_id, exporter=get_metrics_exporters()[0])
 
 # Set up the page title and description
 st.title("Enhanced Innovation Opportunity Evaluation Framework")
 st.markdown("""
-This tool evaluates up to 12 innovation opportunities at both the organization and plant levels by integrating financial metrics, strategic factors, 
+This tool evaluates innovation opportunities at both the organization and plant levels by integrating financial metrics, strategic factors, 
 and principles of innovation. Please input the relevant data below for each innovation idea, including resource, value, cost, and process evaluations.
 """)
 
+# Shared on-disk database, opened once per server process
+@st.cache_resource
+def get_datastore():
+    return DataStore()
+
+db = get_datastore()
+
+# Initialize or retrieve stored data: one columnar store keyed by innovation id,
+# loaded from disk once per session rather than on every rerun
+if 'innovation_store' not in st.session_state:
+    store = InnovationStore()
+    saved_inputs = db.latest('innovation_inputs')
+    saved_metrics = db.latest('innovation_metrics')
+    store.add_many({idea_id: {**record, **saved_metrics.get(idea_id, {})} for idea_id, record in saved_inputs.items()})
+    if not saved_inputs:
+        for _ in range(12):
+            idea_id = store.add()
+            db.append('innovation_inputs', idea_id, store.get(idea_id))
+    st.session_state.innovation_store = store
+store = st.session_state.innovation_store
+timer.mark('load_data')
+
+PAGE_SIZE = 25
+
 # Sidebar pane for selecting innovation ideas to analyze
 st.sidebar.title("Select Innovation Idea")
-innovation_ideas = [f"Innovation {i}" for i in range(1, 13)]
-selected_innovation = st.sidebar.selectbox("Choose an Innovation Idea to Analyze", innovation_ideas)
+add_idea = st.sidebar.button("Add Innovation Idea")
+if add_idea:
+    new_idea = store.add()
+    db.append('innovation_inputs', new_idea, store.get(new_idea))
+
+# Filter the ideas through the plant / technology type / status indexes
+with st.sidebar.expander("Filter Innovation Ideas"):
+    filters = {column: st.multiselect(column, store.values(column), key=f"filter_{column}") for column in INDEXED_COLUMNS}
+innovation_ideas = store.filter(filters)
+if not innovation_ideas:
+    st.sidebar.warning("No innovation ideas match the selected filters.")
+    st.stop()
+
+# Only the current page of ideas is sent to the selector widget
+pages = page_count(len(innovation_ideas), PAGE_SIZE)
+if add_idea and new_idea in innovation_ideas:
+    # Jump to the page holding the newly added idea
+    st.session_state.selector_page = innovation_ideas.index(new_idea) // PAGE_SIZE + 1
+    st.session_state.selected_innovation = new_idea
+page_number = st.sidebar.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1, key="selector_page")
+page_ideas = page(innovation_ideas, page_number, PAGE_SIZE)
+if st.session_state.get('selected_innovation') not in page_ideas:
+    st.session_state.selected_innovation = page_ideas[0]
+selected_innovation = st.sidebar.selectbox("Choose an Innovation Idea to Analyze", page_ideas, key="selected_innovation")
 
-# Initialize or retrieve stored data
-if 'innovation_data' not in st.session_state:
-    st.session_state.innovation_data = {idea: pd.DataFrame() for idea in innovation_ideas}  # Initialize all ideas with empty DataFrames
+timer.mark('sidebar_selector')
 
-# Function to perform calculations for the chosen innovation idea
-def calculate_metrics(data):
-    # Perform calculations
+# Metrics cache shared by every session: entries are keyed by input content, not by session
+@st.cache_resource
+def get_metrics_cache():
+    return MetricsCache()
+
+metrics_cache = get_metrics_cache()
+
+# Rendered charts are cached per server process, keyed by the data they plot
+@st.cache_resource
+def get_chart_cache():
+    return ChartCache()
+
+chart_cache = get_chart_cache()
+
+def draw_percentile_bands(ax, ideas, low, median, high, label):
+    positions = range(len(ideas))
+    ax.vlines(positions, low, high, color='lightblue', linewidth=6, label='P5 to P95')
+    ax.scatter(positions, median, color='blue', zorder=3, label='Median')
+    ax.set_xticks(list(positions))
+    ax.set_xticklabels(ideas, rotation=60, ha='right')
+    ax.set_title(f"{label}: Sensitivity Bands of Top-Ranked Innovations")
+    ax.set_ylabel(label)
+    ax.legend()
+
+# Function to perform calculations for the chosen innovation idea(s)
+def calculate_metrics(data, warn=True):
+    # Scoring is column-wise, so `data` may hold one innovation or many;
+    # rows whose numeric inputs were scored before come straight from the metrics cache
     try:
-        data['Incremental Market Share Gain (%)'] = ((data['Post-Innovation Market Share'] - data['Pre-Innovation Market Share']) / data['Pre-Innovation Market Share']) * 100
-        data['Contribution to Sales (%)'] = ((data['Sales After Innovation'] - data['Sales Before Innovation']) / data['Sales Before Innovation']) * 100
-        data['Contribution to Gross Margin (%)'] = ((data['Gross Profit After Innovation'] - data['Gross Profit Before Innovation']) / (data['Sales After Innovation'] - data['Sales Before Innovation'])) * 100
-        data['Contribution to Net Profit Margin (%)'] = ((data['Net Profit After Innovation'] - data['Net Profit Before Innovation']) / (data['Sales After Innovation'] - data['Sales Before Innovation'])) * 100
-        data['Inventory Velocity (Times per year)'] = data['Cost of Goods Sold'] / ((data['Beginning Inventory'] + data['Ending Inventory']) / 2)
-        data['ROIC (%)'] = (data['Net Operating Profit After Taxes'] / data['Invested Capital (Market Value)']) * 100
-        data['Cash Generation (in $)'] = (data['Sales After Innovation'] - data['Sales Before Innovation']) - data['Incremental Costs'] - data['Incremental Capital Expenditure']
-        
+        with span('innovation', 'calculate_metrics'):
+            scored = metrics_cache.score(data)
+        data = data.copy()
+        for column in METRIC_COLUMNS:
+            data[column] = scored[column]
         # Add critical conditions that must hold true for the analysis to be valid
-        data['Critical Conditions'] = (
-            f"Must achieve a market share gain > 0. Current gain: {data['Incremental Market Share Gain (%)'].iloc[0]:.2f}% | "
-            f"ROIC should be > WACC. Current ROIC: {data['ROIC (%)'].iloc[0]:.2f}% | "
-            f"Cash generation should be positive: ${data['Cash Generation (in $)'].iloc[0]:.2f}"
-        )
+        data['Critical Conditions'] = format_critical_conditions(scored)
+        data['Conditions Met'] = scored['Conditions Met']
+        invalid = [column for column in METRIC_COLUMNS if scored[f"{column} Invalid"].any()]
+        if invalid and warn:
+            st.warning(f"Could not compute (division by zero or missing input): {', '.join(invalid)}")
     except Exception as e:
         st.error(f"Error in calculations: {e}")
     return data
@@ -42,148 +130,238 @@ def calculate_metrics(data):
 # Collect input data for the selected innovation idea
 st.header(f"Input Data for {selected_innovation}")
 
-# Check if we already have data for this innovation, otherwise set default values
-existing_data = st.session_state.innovation_data[selected_innovation]
-if not existing_data.empty:
-    # Load existing data values into input fields
-    data = existing_data.iloc[0].to_dict()
-else:
-    # Set default values if no data exists
-    data = {
-        'Pre-Innovation Market Share': 0.0,
-        'Post-Innovation Market Share': 0.0,
-        'Sales Before Innovation': 0.0,
-        'Sales After Innovation': 0.0,
-        'Gross Profit Before Innovation': 0.0,
-        'Gross Profit After Innovation': 0.0,
-        'Net Profit Before Innovation': 0.0,
-        'Net Profit After Innovation': 0.0,
-        'Cost of Goods Sold': 0.0,
-        'Beginning Inventory': 0.0,
-        'Ending Inventory': 0.0,
-        'Net Operating Profit After Taxes': 0.0,
-        'Invested Capital (Market Value)': 0.0,
-        'Incremental Costs': 0.0,
-        'Incremental Capital Expenditure': 0.0,
-        'Sales Team Availability': 'No',
-        'Sales Team Challenges': '',
-        'Distribution Network Readiness': 'No',
-        'Distribution Network Challenges': '',
-        'Value 1': '',
-        'Value 1 Alignment': 'No',
-        'Value 2': '',
-        'Value 2 Alignment': 'No',
-        'Value 3': '',
-        'Value 3 Alignment': 'No',
-        'Cost Feasibility': 'No',
-        'Cost Challenges': '',
-        'Process Capability': 'No',
-        'Process Challenges': '',
-        'Technology Type': 'Sustaining'  # Default value can be Sustaining or Disruptive
-    }
-
-# Collect data from user input
-data['Pre-Innovation Market Share'] = st.number_input("Pre-Innovation Market Share (%)", value=data['Pre-Innovation Market Share'], key=f"{selected_innovation}_PreMS")
-data['Post-Innovation Market Share'] = st.number_input("Post-Innovation Market Share (%)", value=data['Post-Innovation Market Share'], key=f"{selected_innovation}_PostMS")
-data['Sales Before Innovation'] = st.number_input("Sales Before Innovation ($)", value=data['Sales Before Innovation'], key=f"{selected_innovation}_SalesBefore")
-data['Sales After Innovation'] = st.number_input("Sales After Innovation ($)", value=data['Sales After Innovation'], key=f"{selected_innovation}_SalesAfter")
-data['Gross Profit Before Innovation'] = st.number_input("Gross Profit Before Innovation ($)", value=data['Gross Profit Before Innovation'], key=f"{selected_innovation}_GPBefore")
-data['Gross Profit After Innovation'] = st.number_input("Gross Profit After Innovation ($)", value=data['Gross Profit After Innovation'], key=f"{selected_innovation}_GPAfter")
-data['Net Profit Before Innovation'] = st.number_input("Net Profit Before Innovation ($)", value=data['Net Profit Before Innovation'], key=f"{selected_innovation}_NPBefore")
-data['Net Profit After Innovation'] = st.number_input("Net Profit After Innovation ($)", value=data['Net Profit After Innovation'], key=f"{selected_innovation}_NPAfter")
-data['Cost of Goods Sold'] = st.number_input("Cost of Goods Sold ($)", value=data['Cost of Goods Sold'], key=f"{selected_innovation}_COGS")
-data['Beginning Inventory'] = st.number_input("Beginning Inventory ($)", value=data['Beginning Inventory'], key=f"{selected_innovation}_BegInv")
-data['Ending Inventory'] = st.number_input("Ending Inventory ($)", value=data['Ending Inventory'], key=f"{selected_innovation}_EndInv")
-data['Net Operating Profit After Taxes'] = st.number_input("Net Operating Profit After Taxes (NOPAT) ($)", value=data['Net Operating Profit After Taxes'], key=f"{selected_innovation}_NOPAT")
-data['Invested Capital (Market Value)'] = st.number_input("Invested Capital (Market Value) ($)", value=data['Invested Capital (Market Value)'], key=f"{selected_innovation}_InvestedCapital")
-data['Incremental Costs'] = st.number_input("Incremental Costs ($)", value=data['Incremental Costs'], key=f"{selected_innovation}_IncrCosts")
-data['Incremental Capital Expenditure'] = st.number_input("Incremental Capital Expenditure ($)", value=data['Incremental Capital Expenditure'], key=f"{selected_innovation}_IncrCapExp")
-
-# New Resource Evaluation Fields
-st.subheader("Resource Evaluation")
-data['Sales Team Availability'] = st.selectbox("Sales Team Availability", ["Yes", "No"], index=1 if data['Sales Team Availability'] == "No" else 0)
-data['Sales Team Challenges'] = st.text_input("Sales Team Challenges", value=data['Sales Team Challenges'])
-data['Distribution Network Readiness'] = st.selectbox("Distribution Network Readiness", ["Yes", "No"], index=1 if data['Distribution Network Readiness'] == "No" else 0)
-data['Distribution Network Challenges'] = st.text_input("Distribution Network Challenges", value=data['Distribution Network Challenges'])
-
-# Value Evaluation
-st.subheader("Value Evaluation")
-data['Value 1'] = st.text_input("Value 1 Description", value=data['Value 1'])
-data['Value 1 Alignment'] = st.selectbox("Value 1 Alignment", ["Yes", "No"], index=1 if data['Value 1 Alignment'] == "No" else 0)
-data['Value 2'] = st.text_input("Value 2 Description", value=data['Value 2'])
-data['Value 2 Alignment'] = st.selectbox("Value 2 Alignment", ["Yes", "No"], index=1 if data['Value 2 Alignment'] == "No" else 0)
-data['Value 3'] = st.text_input("Value 3 Description", value=data['Value 3'])
-data['Value 3 Alignment'] = st.selectbox("Value 3 Alignment", ["Yes", "No"], index=1 if data['Value 3 Alignment'] == "No" else 0)
-
-# Cost Evaluation
-st.subheader("Cost Evaluation")
-data['Cost Feasibility'] = st.selectbox("Is the innovation feasible within the company’s cost structure?", 
-                                        ["Yes", "No"], 
-                                        index=1 if data['Cost Feasibility'] == "No" else 0, 
-                                        key=f"{selected_innovation}_CostFeasibility")
-data['Cost Challenges'] = st.text_input("Cost Challenges", value=data['Cost Challenges'], key=f"{selected_innovation}_CostChallenges")
-
-# Process Evaluation
-st.subheader("Process Evaluation")
-data['Process Capability'] = st.selectbox("Are current processes capable of handling the innovation?", 
-                                          ["Yes", "No"], 
-                                          index=1 if data['Process Capability'] == "No" else 0, 
-                                          key=f"{selected_innovation}_ProcessCapability")
-data['Process Challenges'] = st.text_input("Process Challenges", value=data['Process Challenges'], key=f"{selected_innovation}_ProcessChallenges")
-
-# Technology Type Evaluation
-st.subheader("Technology Type Evaluation")
-data['Technology Type'] = st.selectbox("Is it a Sustaining or Disruptive Technology?", 
-                                       ["Sustaining", "Disruptive"], 
-                                       index=0 if data['Technology Type'] == "Sustaining" else 1, 
-                                       key=f"{selected_innovation}_TechnologyType")
-
-# Saving the data back into the session state
-df = pd.DataFrame([data])
-st.session_state.innovation_data[selected_innovation] = df
-
-# Display calculated metrics when the user clicks a button
-if st.button("Calculate and Save Metrics for This Innovation"):
-    metrics_df = calculate_metrics(df)
+# Load the stored values (defaults for a new idea) into the input fields
+data = store.get(selected_innovation)
+
+def option_index(options, value):
+    # Position of a stored choice; a missing or unrecognised value leaves the selectbox empty
+    # rather than silently picking (and on the next save, storing) the first option
+    return options.index(value) if value in options else None
+
+# Collect data from user input. The widgets sit in a form, so edits are batched into one
+# rerun on submit instead of one rerun per keystroke; every widget key is unique per idea.
+with st.form(f"{selected_innovation}_form"):
+    data['Pre-Innovation Market Share'] = st.number_input("Pre-Innovation Market Share (%)", value=data['Pre-Innovation Market Share'], key=f"{selected_innovation}_PreMS")
+    data['Post-Innovation Market Share'] = st.number_input("Post-Innovation Market Share (%)", value=data['Post-Innovation Market Share'], key=f"{selected_innovation}_PostMS")
+    data['Sales Before Innovation'] = st.number_input("Sales Before Innovation ($)", value=data['Sales Before Innovation'], key=f"{selected_innovation}_SalesBefore")
+    data['Sales After Innovation'] = st.number_input("Sales After Innovation ($)", value=data['Sales After Innovation'], key=f"{selected_innovation}_SalesAfter")
+    data['Gross Profit Before Innovation'] = st.number_input("Gross Profit Before Innovation ($)", value=data['Gross Profit Before Innovation'], key=f"{selected_innovation}_GPBefore")
+    data['Gross Profit After Innovation'] = st.number_input("Gross Profit After Innovation ($)", value=data['Gross Profit After Innovation'], key=f"{selected_innovation}_GPAfter")
+    data['Net Profit Before Innovation'] = st.number_input("Net Profit Before Innovation ($)", value=data['Net Profit Before Innovation'], key=f"{selected_innovation}_NPBefore")
+    data['Net Profit After Innovation'] = st.number_input("Net Profit After Innovation ($)", value=data['Net Profit After Innovation'], key=f"{selected_innovation}_NPAfter")
+    data['Cost of Goods Sold'] = st.number_input("Cost of Goods Sold ($)", value=data['Cost of Goods Sold'], key=f"{selected_innovation}_COGS")
+    data['Beginning Inventory'] = st.number_input("Beginning Inventory ($)", value=data['Beginning Inventory'], key=f"{selected_innovation}_BegInv")
+    data['Ending Inventory'] = st.number_input("Ending Inventory ($)", value=data['Ending Inventory'], key=f"{selected_innovation}_EndInv")
+    data['Net Operating Profit After Taxes'] = st.number_input("Net Operating Profit After Taxes (NOPAT) ($)", value=data['Net Operating Profit After Taxes'], key=f"{selected_innovation}_NOPAT")
+    data['Invested Capital (Market Value)'] = st.number_input("Invested Capital (Market Value) ($)", value=data['Invested Capital (Market Value)'], key=f"{selected_innovation}_InvestedCapital")
+    data['Incremental Costs'] = st.number_input("Incremental Costs ($)", value=data['Incremental Costs'], key=f"{selected_innovation}_IncrCosts")
+    data['Incremental Capital Expenditure'] = st.number_input("Incremental Capital Expenditure ($)", value=data['Incremental Capital Expenditure'], key=f"{selected_innovation}_IncrCapExp")
+
+    # New Resource Evaluation Fields
+    st.subheader("Resource Evaluation")
+    data['Sales Team Availability'] = st.selectbox("Sales Team Availability", YES_NO, index=option_index(YES_NO, data['Sales Team Availability']), key=f"{selected_innovation}_SalesTeamAvailability")
+    data['Sales Team Challenges'] = st.text_input("Sales Team Challenges", value=data['Sales Team Challenges'], key=f"{selected_innovation}_SalesTeamChallenges")
+    data['Distribution Network Readiness'] = st.selectbox("Distribution Network Readiness", YES_NO, index=option_index(YES_NO, data['Distribution Network Readiness']), key=f"{selected_innovation}_DistributionReadiness")
+    data['Distribution Network Challenges'] = st.text_input("Distribution Network Challenges", value=data['Distribution Network Challenges'], key=f"{selected_innovation}_DistributionChallenges")
+
+    # Value Evaluation
+    st.subheader("Value Evaluation")
+    data['Value 1'] = st.text_input("Value 1 Description", value=data['Value 1'], key=f"{selected_innovation}_Value1")
+    data['Value 1 Alignment'] = st.selectbox("Value 1 Alignment", YES_NO, index=option_index(YES_NO, data['Value 1 Alignment']), key=f"{selected_innovation}_Value1Alignment")
+    data['Value 2'] = st.text_input("Value 2 Description", value=data['Value 2'], key=f"{selected_innovation}_Value2")
+    data['Value 2 Alignment'] = st.selectbox("Value 2 Alignment", YES_NO, index=option_index(YES_NO, data['Value 2 Alignment']), key=f"{selected_innovation}_Value2Alignment")
+    data['Value 3'] = st.text_input("Value 3 Description", value=data['Value 3'], key=f"{selected_innovation}_Value3")
+    data['Value 3 Alignment'] = st.selectbox("Value 3 Alignment", YES_NO, index=option_index(YES_NO, data['Value 3 Alignment']), key=f"{selected_innovation}_Value3Alignment")
+
+    # Cost Evaluation
+    st.subheader("Cost Evaluation")
+    data['Cost Feasibility'] = st.selectbox("Is the innovation feasible within the company’s cost structure?", 
+                                            YES_NO, 
+                                            index=option_index(YES_NO, data['Cost Feasibility']), 
+                                            key=f"{selected_innovation}_CostFeasibility")
+    data['Cost Challenges'] = st.text_input("Cost Challenges", value=data['Cost Challenges'], key=f"{selected_innovation}_CostChallenges")
+
+    # Process Evaluation
+    st.subheader("Process Evaluation")
+    data['Process Capability'] = st.selectbox("Are current processes capable of handling the innovation?", 
+                                              YES_NO, 
+                                              index=option_index(YES_NO, data['Process Capability']), 
+                                              key=f"{selected_innovation}_ProcessCapability")
+    data['Process Challenges'] = st.text_input("Process Challenges", value=data['Process Challenges'], key=f"{selected_innovation}_ProcessChallenges")
+
+    # Technology Type Evaluation
+    st.subheader("Technology Type Evaluation")
+    data['Technology Type'] = st.selectbox("Is it a Sustaining or Disruptive Technology?", 
+                                           TECHNOLOGY_TYPES, 
+                                           index=option_index(TECHNOLOGY_TYPES, data['Technology Type']), 
+                                           key=f"{selected_innovation}_TechnologyType")
+
+    # Innovation Tracking
+    st.subheader("Innovation Tracking")
+    data['Plant'] = st.text_input("Plant / Organization Unit", value=data['Plant'], key=f"{selected_innovation}_Plant")
+    data['Status'] = st.selectbox("Status", STATUS_OPTIONS,
+                                  index=option_index(STATUS_OPTIONS, data['Status']),
+                                  key=f"{selected_innovation}_Status")
+
+    save_inputs = st.form_submit_button("Save Inputs")
+    calculate = st.form_submit_button("Calculate and Save Metrics for This Innovation")
+
+timer.mark('input_widgets')
+
+# Saving only the fields that changed back into the store; the on-disk log gets one new
+# version of the record, and only when something changed
+if save_inputs or calculate:
+    changed = store.diff(selected_innovation, data)
+    if changed:
+        store.update(selected_innovation, changed)
+        db.append('innovation_inputs', selected_innovation, data)
+        st.session_state.pop('sweep_bands', None)  # Sweep results were computed from the old inputs
+        st.success(f"Saved {len(changed)} changed field(s) for {selected_innovation}")
+
+timer.mark('save')
+
+# Display calculated metrics when the user clicks the calculate button
+if calculate:
+    metrics_df = calculate_metrics(store.rows([selected_innovation]))
+    metrics = metrics_df.iloc[0][METRIC_COLUMNS + ['Critical Conditions', 'Conditions Met']].to_dict()
+    store.update(selected_innovation, metrics)
+    db.append('innovation_metrics', selected_innovation, metrics)
     st.write("**Calculated Metrics for this Innovation:**")
     st.dataframe(metrics_df)
     st.success(f"Metrics calculated and saved for {selected_innovation}")
 
+timer.mark('calculate_button')
+
 # Comparison Functionality
 st.sidebar.subheader("Compare Innovation Ideas")
-selected_comparisons = st.sidebar.multiselect("Select up to 4 innovations to compare", innovation_ideas, default=[])
+compare_all = st.sidebar.checkbox("Compare all filtered innovations")
+if compare_all:
+    selected_comparisons = innovation_ideas
+else:
+    # Like the selector, the picker only receives one page of matching ideas (plus those already
+    # chosen), so its cost does not grow with the number of ideas
+    compare_query = st.sidebar.text_input("Search innovations to compare", key="compare_query").strip().lower()
+    candidates = [idea for idea in innovation_ideas if compare_query in idea.lower()] if compare_query else innovation_ideas
+    candidate_pages = page_count(len(candidates), PAGE_SIZE)
+    if st.session_state.get('compare_page', 1) > candidate_pages:
+        st.session_state.compare_page = 1
+    candidate_page = st.sidebar.number_input(f"Compare page (of {candidate_pages})", min_value=1, max_value=candidate_pages,
+                                             step=1, key="compare_page")
+    filtered = set(innovation_ideas)
+    chosen = [idea for idea in st.session_state.get('compare_chosen', []) if idea in filtered]
+    options = list(dict.fromkeys(chosen + page(candidates, candidate_page, PAGE_SIZE)))
+    selected_comparisons = st.sidebar.multiselect("Select innovations to compare", options, default=chosen)
+    st.session_state.compare_chosen = selected_comparisons
 
 if len(selected_comparisons) > 0:
-    # Display comparison of selected innovations
-    comparison_df = pd.concat([st.session_state.innovation_data[idea] for idea in selected_comparisons if not st.session_state.innovation_data[idea].empty])
-    
-    if not comparison_df.empty:
-        st.header("Innovation Comparison Analysis")
-        comparison_df.index = selected_comparisons
-        st.dataframe(comparison_df[[
-            'Incremental Market Share Gain (%)', 
-            'Contribution to Sales (%)', 
-            'Contribution to Gross Margin (%)', 
-            'Contribution to Net Profit Margin (%)',
-            'Inventory Velocity (Times per year)', 
-            'ROIC (%)', 
-            'Cash Generation (in $)',
-            'Critical Conditions',
-            'Sales Team Availability', 
-            'Sales Team Challenges', 
-            'Distribution Network Readiness',
-            'Distribution Network Challenges',
-            'Value 1', 'Value 1 Alignment',
-            'Value 2', 'Value 2 Alignment',
-            'Value 3', 'Value 3 Alignment',
-            'Cost Feasibility', 'Cost Challenges',
-            'Process Capability', 'Process Challenges',
-            'Technology Type'
-        ]])
-    else:
-        st.warning("Selected innovations do not have any saved data for comparison.")
+    # Display comparison of selected innovations, one page at a time
+    st.header("Innovation Comparison Analysis")
+    comparison_pages = page_count(len(selected_comparisons), PAGE_SIZE)
+    comparison_page = st.number_input(f"Comparison page (of {comparison_pages})", min_value=1, max_value=comparison_pages, step=1)
+    # Metrics are derived from the current inputs, so the table never shows stale results
+    comparison_df = calculate_metrics(store.rows(page(selected_comparisons, comparison_page, PAGE_SIZE)), warn=False)
+    st.dataframe(comparison_df[[
+        'Plant',
+        'Status',
+        'Incremental Market Share Gain (%)', 
+        'Contribution to Sales (%)', 
+        'Contribution to Gross Margin (%)', 
+        'Contribution to Net Profit Margin (%)',
+        'Inventory Velocity (Times per year)', 
+        'ROIC (%)', 
+        'Cash Generation (in $)',
+        'Critical Conditions',
+        'Sales Team Availability', 
+        'Sales Team Challenges', 
+        'Distribution Network Readiness',
+        'Distribution Network Challenges',
+        'Value 1', 'Value 1 Alignment',
+        'Value 2', 'Value 2 Alignment',
+        'Value 3', 'Value 3 Alignment',
+        'Cost Feasibility', 'Cost Challenges',
+        'Process Capability', 'Process Challenges',
+        'Technology Type'
+    ]])
 else:
-    st.info("Select up to 4 innovations from the sidebar to compare their metrics.")
+    st.info("Select innovations from the sidebar to compare their metrics.")
+
+timer.mark('comparison')
+
+# Portfolio Analysis: rank every filtered innovation and stress-test its inputs
+st.sidebar.subheader("Portfolio Analysis")
+if st.sidebar.checkbox("Rank and stress-test all filtered innovations"):
+    st.header("Portfolio Ranking")
+    portfolio_df = store.rows(innovation_ideas)
+    ranking = rank_portfolio(portfolio_df)
+    st.dataframe(ranking)
+
+    st.subheader("What-If Sensitivity Sweep")
+    with st.form("sensitivity_form"):
+        sales_spread = st.slider("Sales After Innovation ± (%)", 0, 50, 20)
+        capex_spread = st.slider("Incremental Capital Expenditure ± (%)", 0, 50, 30)
+        samples = st.number_input("Monte Carlo samples per innovation", min_value=100, max_value=100_000, value=10_000, step=1_000)
+        run_sweep = st.form_submit_button("Run Sensitivity Sweep")
+    if run_sweep:
+        ranges = {'Sales After Innovation': sales_spread / 100, 'Incremental Capital Expenditure': capex_spread / 100}
+        st.session_state.sweep_bands = monte_carlo(portfolio_df, ranges=ranges, samples=int(samples))
+
+    if 'sweep_bands' in st.session_state:
+        bands = st.session_state.sweep_bands
+        bands = bands.loc[bands.index.intersection(ranking.index)]
+        st.write("**5th / 50th / 95th percentile bands:**")
+        st.dataframe(bands)
+        # Cash generation bands of the top-ranked innovations
+        top = [idea for idea in ranking.index if idea in bands.index][:20]
+        column = 'Cash Generation (in $)'
+        with span('innovation', 'render_chart'):
+            band_chart = chart_cache.render(draw_percentile_bands, tuple(top), tuple(bands.loc[top, f"{column} P5"]),
+                                            tuple(bands.loc[top, f"{column} P50"]), tuple(bands.loc[top, f"{column} P95"]), column)
+        st.image(band_chart)
+
+timer.mark('portfolio')
+
+# Bulk import / export of the saved innovation inputs
+with st.sidebar.expander("Import / Export Innovation Data"):
+    # The export reads the whole table, so it is only built on request rather than on every rerun
+    if st.button("Prepare Export"):
+        # Both downloads are the latest saved records typed per the innovation schema, so they always
+        # agree (in the Parquet file, categoricals stay dictionary-encoded)
+        exported = apply_schema(db.load_frame('innovation_inputs'))[list(DEFAULT_RECORD)]
+        export_buffer = io.StringIO()
+        exported.to_csv(export_buffer)
+        st.session_state.innovation_export = export_buffer.getvalue()
+        parquet_buffer = io.BytesIO()
+        pq.write_table(to_arrow(exported), parquet_buffer)
+        st.session_state.innovation_export_parquet = parquet_buffer.getvalue()
+    if 'innovation_export' in st.session_state:
+        st.download_button("Export Innovation Inputs (CSV)", st.session_state.innovation_export, file_name="innovation_inputs.csv", mime="text/csv")
+        st.download_button("Export Innovation Inputs (Parquet)", st.session_state.innovation_export_parquet,
+                           file_name="innovation_inputs.parquet", mime="application/octet-stream")
+    uploaded_file = st.file_uploader("Import Innovation Inputs (CSV or Parquet)", type=['csv', 'parquet'])
+    if uploaded_file is not None and st.button("Import"):
+        try:
+            # Yes/No, technology type and status values are normalised; a file with values matching
+            # none of the choices is rejected as a whole rather than imported as blanks
+            imported = db.import_table('innovation_inputs', uploaded_file,
+                                       file_format='parquet' if uploaded_file.name.endswith('.parquet') else 'csv',
+                                       prepare=validate_records)
+        except ValueError as e:
+            st.error(f"Import rejected: {e}")
+        else:
+            del st.session_state.innovation_store  # Reload from disk on the next run
+            st.session_state.pop('sweep_bands', None)
+            st.success(f"Imported {imported} innovation records.")
+            st.rerun()
+
+# Metrics cache counters and explicit invalidation
+with st.sidebar.expander("Metrics Cache"):
+    cache_stats = metrics_cache.stats()
+    st.write(f"Hits: {cache_stats['hits']} | Misses: {cache_stats['misses']} | Entries: {cache_stats['entries']}/{cache_stats['max_entries']}")
+    if st.button("Clear Metrics Cache"):
+        metrics_cache.clear()
 
 st.sidebar.markdown("---")
-st.sidebar.write("**Reminder:** Ensure you save your input data by pressing the 'Calculate and Save Metrics' button.")                                   
+st.sidebar.write("**Reminder:** Ensure you save your input data by pressing the 'Save Inputs' or 'Calculate and Save Metrics' button.")
+
+timer.mark('sidebar_tools')
+timer.finish()
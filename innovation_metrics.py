@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+
+# Numeric inputs every innovation record carries, in the order they are entered in the UI
+INPUT_COLUMNS = [
+    'Pre-Innovation Market Share',
+    'Post-Innovation Market Share',
+    'Sales Before Innovation',
+    'Sales After Innovation',
+    'Gross Profit Before Innovation',
+    'Gross Profit After Innovation',
+    'Net Profit Before Innovation',
+    'Net Profit After Innovation',
+    'Cost of Goods Sold',
+    'Beginning Inventory',
+    'Ending Inventory',
+    'Net Operating Profit After Taxes',
+    'Invested Capital (Market Value)',
+    'Incremental Costs',
+    'Incremental Capital Expenditure',
+]
+
+# Derived metrics, in the order they are shown in the comparison table
+METRIC_COLUMNS = [
+    'Incremental Market Share Gain (%)',
+    'Contribution to Sales (%)',
+    'Contribution to Gross Margin (%)',
+    'Contribution to Net Profit Margin (%)',
+    'Inventory Velocity (Times per year)',
+    'ROIC (%)',
+    'Cash Generation (in $)',
+]
+
+# Per-row critical condition flags (True means the condition holds)
+CONDITION_COLUMNS = [
+    'Market Share Gain > 0',
+    'ROIC > WACC',
+    'Cash Generation > 0',
+]
+
+
+def _divide(numerator, denominator):
+    # Column-wise division that returns NaN (instead of inf or an exception) where the denominator is zero
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    out = np.full(np.broadcast(numerator, denominator).shape, np.nan)
+    np.divide(numerator, denominator, out=out, where=denominator != 0)
+    return out
+
+
+def score_arrays(inputs, wacc=0.0):
+    # Compute every derived metric over NumPy arrays.
+    # `inputs` maps each name in INPUT_COLUMNS to a 1-D array; returns a dict of metric arrays,
+    # a dict of per-metric invalid masks (divide-by-zero or NaN) and a dict of condition flags.
+    col = {name: np.asarray(inputs[name], dtype=np.float64) for name in INPUT_COLUMNS}
+
+    sales_delta = col['Sales After Innovation'] - col['Sales Before Innovation']
+    average_inventory = (col['Beginning Inventory'] + col['Ending Inventory']) / 2
+
+    metrics = {
+        'Incremental Market Share Gain (%)': _divide(
+            col['Post-Innovation Market Share'] - col['Pre-Innovation Market Share'],
+            col['Pre-Innovation Market Share']) * 100,
+        'Contribution to Sales (%)': _divide(sales_delta, col['Sales Before Innovation']) * 100,
+        'Contribution to Gross Margin (%)': _divide(
+            col['Gross Profit After Innovation'] - col['Gross Profit Before Innovation'], sales_delta) * 100,
+        'Contribution to Net Profit Margin (%)': _divide(
+            col['Net Profit After Innovation'] - col['Net Profit Before Innovation'], sales_delta) * 100,
+        'Inventory Velocity (Times per year)': _divide(col['Cost of Goods Sold'], average_inventory),
+        'ROIC (%)': _divide(col['Net Operating Profit After Taxes'], col['Invested Capital (Market Value)']) * 100,
+        'Cash Generation (in $)': sales_delta - col['Incremental Costs'] - col['Incremental Capital Expenditure'],
+    }
+
+    invalid = {name: np.isnan(values) for name, values in metrics.items()}
+
+    # NaN compares False, so an invalid metric never satisfies its condition
+    conditions = {
+        'Market Share Gain > 0': metrics['Incremental Market Share Gain (%)'] > 0,
+        'ROIC > WACC': metrics['ROIC (%)'] > wacc,
+        'Cash Generation > 0': metrics['Cash Generation (in $)'] > 0,
+    }
+    return metrics, invalid, conditions
+
+
+def score_frame(df, wacc=0.0):
+    # Score a multi-row DataFrame of innovation inputs.
+    # Returns a new frame with the same index holding the metric columns, one boolean
+    # '<metric> Invalid' column per metric, the condition flags and 'Conditions Met'.
+    missing = [name for name in INPUT_COLUMNS if name not in df.columns]
+    if missing:
+        raise KeyError(f"Missing input columns: {', '.join(missing)}")
+
+    inputs = {name: pd.to_numeric(df[name], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+              for name in INPUT_COLUMNS}
+    metrics, invalid, conditions = score_arrays(inputs, wacc=wacc)
+
+    result = pd.DataFrame(metrics, index=df.index)
+    for name in METRIC_COLUMNS:
+        result[f"{name} Invalid"] = invalid[name]
+    for name in CONDITION_COLUMNS:
+        result[name] = conditions[name]
+    result['Conditions Met'] = result[CONDITION_COLUMNS].all(axis=1)
+    return result
+
+
+def format_critical_conditions(scored):
+    # Build the human-readable 'Critical Conditions' text for each row of a scored frame
+    def fmt(values, prefix='', suffix=''):
+        return pd.Series(values, index=scored.index).map(
+            lambda v: 'n/a' if pd.isna(v) else f"{prefix}{v:.2f}{suffix}")
+
+    return ("Must achieve a market share gain > 0. Current gain: "
+            + fmt(scored['Incremental Market Share Gain (%)'], suffix='%') + " | "
+            + "ROIC should be > WACC. Current ROIC: " + fmt(scored['ROIC (%)'], suffix='%') + " | "
+            + "Cash generation should be positive: " + fmt(scored['Cash Generation (in $)'], prefix='$'))
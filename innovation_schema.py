@@ -0,0 +1,153 @@
+import sys
+
+import numpy as np
+import pandas as pd
+
+from innovation_metrics import INPUT_COLUMNS, METRIC_COLUMNS
+
+YES_NO = ['Yes', 'No']
+TECHNOLOGY_TYPES = ['Sustaining', 'Disruptive']
+STATUS_OPTIONS = ['Proposed', 'Under Evaluation', 'Approved', 'Rejected']
+
+# Default values for a new innovation idea
+DEFAULT_RECORD = {
+    **{name: 0.0 for name in INPUT_COLUMNS},
+    'Sales Team Availability': 'No',
+    'Sales Team Challenges': '',
+    'Distribution Network Readiness': 'No',
+    'Distribution Network Challenges': '',
+    'Value 1': '',
+    'Value 1 Alignment': 'No',
+    'Value 2': '',
+    'Value 2 Alignment': 'No',
+    'Value 3': '',
+    'Value 3 Alignment': 'No',
+    'Cost Feasibility': 'No',
+    'Cost Challenges': '',
+    'Process Capability': 'No',
+    'Process Challenges': '',
+    'Technology Type': 'Sustaining',  # Default value can be Sustaining or Disruptive
+    'Plant': 'Organization',
+    'Status': 'Proposed',
+}
+
+# Declared dtype of every stored column:
+# - money and market-share inputs stay float64; derived ratios and percentages fit in float32
+# - Yes/No, technology type and status are categoricals (one byte per row plus a shared dictionary)
+# - free text (descriptions, challenges, plant names) is an object column of interned strings
+SCHEMA = {
+    **{name: np.dtype(np.float64) for name in INPUT_COLUMNS},
+    **{name: np.dtype(np.float32) for name in METRIC_COLUMNS if name != 'Cash Generation (in $)'},
+    'Cash Generation (in $)': np.dtype(np.float64),
+    'Sales Team Availability': pd.CategoricalDtype(YES_NO),
+    'Distribution Network Readiness': pd.CategoricalDtype(YES_NO),
+    'Value 1 Alignment': pd.CategoricalDtype(YES_NO),
+    'Value 2 Alignment': pd.CategoricalDtype(YES_NO),
+    'Value 3 Alignment': pd.CategoricalDtype(YES_NO),
+    'Cost Feasibility': pd.CategoricalDtype(YES_NO),
+    'Process Capability': pd.CategoricalDtype(YES_NO),
+    'Technology Type': pd.CategoricalDtype(TECHNOLOGY_TYPES),
+    'Status': pd.CategoricalDtype(STATUS_OPTIONS),
+    'Conditions Met': pd.BooleanDtype(),
+}
+
+TEXT_COLUMNS = [
+    'Sales Team Challenges',
+    'Distribution Network Challenges',
+    'Value 1',
+    'Value 2',
+    'Value 3',
+    'Cost Challenges',
+    'Process Challenges',
+    'Plant',
+    'Critical Conditions',
+]
+
+COLUMNS = list(DEFAULT_RECORD) + METRIC_COLUMNS + ['Critical Conditions', 'Conditions Met']
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _category_lookup(dtype):
+    return {str(category).strip().lower(): category for category in dtype.categories}
+
+
+def coerce_value(column, value):
+    # Convert one field to the type its column stores, e.g. before writing a single cell
+    dtype = SCHEMA.get(column)
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return value
+    if isinstance(dtype, np.dtype):
+        return dtype.type(value)
+    if isinstance(dtype, pd.BooleanDtype):
+        return bool(value)
+    if isinstance(dtype, pd.CategoricalDtype):
+        normalized = _category_lookup(dtype).get(str(value).strip().lower())
+        if normalized is None:
+            raise ValueError(f"{value!r} is not a valid {column} (expected one of {', '.join(dtype.categories)})")
+        return normalized
+    if column in TEXT_COLUMNS:
+        return _intern(str(value))
+    return value
+
+
+def normalize_categories(frame):
+    # Map case and whitespace variants ('yes', ' sustaining') onto the declared categories.
+    # Returns the normalised copy and {column: values matching no category}; blanks count as missing.
+    frame = frame.copy()
+    unknown = {}
+    for column, dtype in SCHEMA.items():
+        if not isinstance(dtype, pd.CategoricalDtype) or column not in frame:
+            continue
+        lookup = _category_lookup(dtype)
+        values = frame[column].astype(object)
+        missing = values.isna() | (values.astype(str).str.strip() == '')
+        normalized = values.astype(str).str.strip().str.lower().map(lookup)
+        bad = ~missing & normalized.isna()
+        if bad.any():
+            unknown[column] = sorted(values[bad].astype(str).unique())
+        frame[column] = normalized.where(~missing, np.nan).astype(object)
+    return frame, unknown
+
+
+def validate_records(frame):
+    # Normalised copy of imported innovation records; rejects values that match no category
+    frame, unknown = normalize_categories(frame)
+    if unknown:
+        details = '; '.join(f"{column}: {', '.join(values)}" for column, values in unknown.items())
+        raise ValueError(f"Unrecognised values ({details})")
+    return frame
+
+
+def apply_schema(frame):
+    # Cast a frame of innovation records to the declared column types.
+    # Categorical values are matched ignoring case and surrounding whitespace; anything still
+    # unrecognised becomes missing (validate_records keeps such values out of the database).
+    frame, _ = normalize_categories(frame.reindex(columns=COLUMNS))
+    columns = {}
+    for column in COLUMNS:
+        values = frame[column]
+        dtype = SCHEMA.get(column)
+        if isinstance(dtype, np.dtype):
+            columns[column] = pd.to_numeric(values, errors='coerce').astype(dtype)
+        elif isinstance(dtype, pd.BooleanDtype):
+            columns[column] = values.map({True: True, False: False, 'True': True, 'False': False}).astype(dtype)
+        elif dtype is not None:
+            columns[column] = values.astype(dtype)
+        else:
+            columns[column] = values.map(_intern, na_action='ignore').astype(object)
+    return pd.DataFrame(columns, index=frame.index)
+
+
+def empty_frame(index_name='Innovation ID'):
+    return apply_schema(pd.DataFrame(columns=COLUMNS, index=pd.Index([], name=index_name)))
+
+
+def to_arrow(frame, preserve_index=True):
+    # Arrow table of typed records: numeric columns are handed over without copying and
+    # categoricals become dictionary-encoded columns. Requires pyarrow.
+    import pyarrow as pa
+
+    return pa.Table.from_pandas(frame, preserve_index=preserve_index)
@@ -0,0 +1,125 @@
+import math
+
+import pandas as pd
+
+from innovation_schema import DEFAULT_RECORD, apply_schema, coerce_value, empty_frame
+
+# Columns with a secondary index for fast filtering
+INDEXED_COLUMNS = ['Plant', 'Technology Type', 'Status']
+
+
+class InnovationStore:
+    # One columnar table of innovation ideas keyed by innovation id, typed per innovation_schema,
+    # with secondary indexes (value -> set of ids) on plant, technology type and status
+
+    def __init__(self):
+        self.frame = empty_frame()
+        self.indexes = {column: {} for column in INDEXED_COLUMNS}
+        self._next_number = 1
+
+    def __len__(self):
+        return len(self.frame)
+
+    def __contains__(self, idea_id):
+        return idea_id in self.frame.index
+
+    def ids(self):
+        return list(self.frame.index)
+
+    def add(self, record=None, idea_id=None):
+        # Add a new idea (defaults for any missing field) and return its id
+        if idea_id is None:
+            while f"Innovation {self._next_number}" in self.frame.index:
+                self._next_number += 1
+            idea_id = f"Innovation {self._next_number}"
+        if idea_id in self.frame.index:
+            raise KeyError(f"{idea_id} already exists")
+        self.add_many({idea_id: record or {}})
+        return idea_id
+
+    def add_many(self, records):
+        # Bulk-load {idea_id: record} in one frame construction instead of one row at a time
+        new_ids = [idea_id for idea_id in records if idea_id not in self.frame.index]
+        if len(new_ids) != len(records):
+            raise KeyError("Some innovation ids already exist")
+        if not new_ids:
+            return []
+        rows = apply_schema(pd.DataFrame.from_records([{**DEFAULT_RECORD, **records[idea_id]} for idea_id in new_ids],
+                                                      index=pd.Index(new_ids, name='Innovation ID')))
+        self.frame = rows if self.frame.empty else pd.concat([self.frame, rows])
+        for column in INDEXED_COLUMNS:
+            for value, ids in rows.groupby(column, sort=False, observed=True).groups.items():
+                self.indexes[column].setdefault(value, set()).update(ids)
+        return new_ids
+
+    def get(self, idea_id):
+        # Return the stored fields of one idea as a plain dict
+        row = self.frame.loc[idea_id]
+        return {column: row[column] for column in DEFAULT_RECORD}
+
+    def diff(self, idea_id, values):
+        # The fields of `values` that differ from the stored idea; a missing value (None or NaN)
+        # equals any other missing value
+        stored = self.get(idea_id)
+        return {column: value for column, value in values.items()
+                if column in stored and value != stored[column]
+                and not (pd.isna(value) and pd.isna(stored[column]))}
+
+    def update(self, idea_id, values):
+        # Write only the given fields for an existing idea
+        if idea_id not in self.frame.index:
+            raise KeyError(idea_id)
+        values = {column: coerce_value(column, value) for column, value in values.items() if column in self.frame.columns}
+        for column in INDEXED_COLUMNS:
+            if column in values:
+                self._unindex(column, self.frame.at[idea_id, column], idea_id)
+        for column, value in values.items():
+            self.frame.at[idea_id, column] = value
+        self._index_row(idea_id, {column: values[column] for column in INDEXED_COLUMNS if column in values})
+
+    def remove(self, idea_id):
+        for column in INDEXED_COLUMNS:
+            self._unindex(column, self.frame.at[idea_id, column], idea_id)
+        self.frame = self.frame.drop(index=idea_id)
+
+    def rows(self, idea_ids):
+        # Select several ideas at once, in the order given, without concatenating frames
+        return self.frame.loc[list(idea_ids)]
+
+    def values(self, column):
+        # Distinct values of an indexed column
+        return sorted(value for value, ids in self.indexes[column].items() if ids)
+
+    def filter(self, criteria):
+        # Ids matching every criterion, in insertion order.
+        # `criteria` maps an indexed column to the accepted values; empty means no restriction
+        matched = None
+        for column, accepted in criteria.items():
+            if not accepted:
+                continue
+            ids = set()
+            for value in accepted:
+                ids |= self.indexes[column].get(value, set())
+            matched = ids if matched is None else matched & ids
+        if matched is None:
+            return self.ids()
+        position = self.frame.index.get_indexer(list(matched))
+        return list(self.frame.index[sorted(position)])
+
+    def _index_row(self, idea_id, row):
+        for column in INDEXED_COLUMNS:
+            if column in row and not pd.isna(row[column]):
+                self.indexes[column].setdefault(row[column], set()).add(idea_id)
+
+    def _unindex(self, column, value, idea_id):
+        self.indexes[column].get(value, set()).discard(idea_id)
+
+
+def page_count(total, page_size):
+    return max(1, math.ceil(total / page_size))
+
+
+def page(items, page_number, page_size):
+    # Slice one 1-based page out of a list of ids
+    start = (page_number - 1) * page_size
+    return items[start:start + page_size]
@@ -0,0 +1,192 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds (seconds) of the section duration histogram buckets
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Sessions tracked individually; older sessions are folded into session="other"
+MAX_SESSIONS = 500
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class MetricsRegistry:
+    # Process-wide timing histograms per (app, section) and rerun counters per app and session.
+    # Recording is a perf_counter read plus a few dict updates under a lock, cheap enough to leave on.
+
+    def __init__(self, max_sessions=MAX_SESSIONS):
+        self.max_sessions = max_sessions
+        self._histograms = {}  # (app, section) -> [bucket counts..., +Inf count, sum]
+        self._reruns = {}  # app -> count
+        self._session_reruns = OrderedDict()  # (app, session) -> count, least recently active first
+        self._other_reruns = {}  # app -> count of sessions evicted from _session_reruns
+        self._lock = threading.Lock()
+
+    def observe(self, app, section, seconds):
+        with self._lock:
+            histogram = self._histograms.get((app, section))
+            if histogram is None:
+                histogram = self._histograms[(app, section)] = [0] * (len(BUCKETS) + 1) + [0.0]
+            histogram[bisect_left(BUCKETS, seconds)] += 1
+            histogram[-1] += seconds
+
+    def count_rerun(self, app, session=None):
+        with self._lock:
+            self._reruns[app] = self._reruns.get(app, 0) + 1
+            if session is None:
+                return
+            key = (app, session)
+            self._session_reruns[key] = self._session_reruns.get(key, 0) + 1
+            self._session_reruns.move_to_end(key)
+            while len(self._session_reruns) > self.max_sessions:
+                (old_app, _), count = self._session_reruns.popitem(last=False)
+                self._other_reruns[old_app] = self._other_reruns.get(old_app, 0) + count
+
+    def render(self):
+        # Prometheus text exposition format
+        with self._lock:
+            histograms = {key: list(values) for key, values in self._histograms.items()}
+            reruns = dict(self._reruns)
+            session_reruns = dict(self._session_reruns)
+            for app, count in self._other_reruns.items():
+                session_reruns[(app, 'other')] = session_reruns.get((app, 'other'), 0) + count
+
+        lines = ['# HELP app_section_seconds Wall time spent in each section of a script run.',
+                 '# TYPE app_section_seconds histogram']
+        for (app, section), values in sorted(histograms.items()):
+            labels = f'app="{_escape(app)}",section="{_escape(section)}"'
+            cumulative = 0
+            for bound, count in zip(BUCKETS, values):
+                cumulative += count
+                lines.append(f'app_section_seconds_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+            cumulative += values[len(BUCKETS)]
+            lines.append(f'app_section_seconds_bucket{{{labels},le="+Inf"}} {cumulative}')
+            lines.append(f'app_section_seconds_sum{{{labels}}} {values[-1]:.6f}')
+            lines.append(f'app_section_seconds_count{{{labels}}} {cumulative}')
+
+        lines += ['# HELP app_reruns_total Script runs per app.', '# TYPE app_reruns_total counter']
+        lines += [f'app_reruns_total{{app="{_escape(app)}"}} {count}' for app, count in sorted(reruns.items())]
+
+        lines += ['# HELP app_session_reruns_total Script runs per app and session.',
+                  '# TYPE app_session_reruns_total counter']
+        lines += [f'app_session_reruns_total{{app="{_escape(app)}",session="{_escape(session)}"}} {count}'
+                  for (app, session), count in sorted(session_reruns.items())]
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+REGISTRY = MetricsRegistry()
+
+
+@contextmanager
+def span(app, section, registry=REGISTRY):
+    # Time a block of code as one section
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        registry.observe(app, section, time.perf_counter() - start)
+
+
+def timed(app, section, registry=REGISTRY):
+    # Decorator form of span(), e.g. for Streamlit fragments that rerun on their own
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(app, section, registry):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class RerunTimer:
+    # Times consecutive sections of a top-to-bottom script run: each mark() records the time
+    # since the previous mark (or the start), and finish() records the whole run
+
+    def __init__(self, app, session=None, registry=REGISTRY, exporter=None):
+        self.app = app
+        self.registry = registry
+        self.exporter = exporter
+        self.start = self._last = time.perf_counter()
+        registry.count_rerun(app, session)
+
+    def mark(self, section):
+        now = time.perf_counter()
+        self.registry.observe(self.app, section, now - self._last)
+        self._last = now
+
+    def finish(self):
+        self.registry.observe(self.app, 'total', time.perf_counter() - self.start)
+        if self.exporter is not None:
+            self.exporter.maybe_write()
+
+
+class FileExporter:
+    # Writes the registry to a file atomically, at most once every `interval` seconds
+
+    def __init__(self, path, registry=REGISTRY, interval=10.0):
+        self.path = path
+        self.registry = registry
+        self.interval = interval
+        self._last_write = 0.0
+        self._lock = threading.Lock()
+
+    def maybe_write(self):
+        now = time.monotonic()
+        if now - self._last_write < self.interval or not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._last_write = now
+            temporary = f"{self.path}.tmp"
+            with open(temporary, 'w', encoding='utf-8') as f:
+                f.write(self.registry.render())
+            os.replace(temporary, self.path)
+        finally:
+            self._lock.release()
+
+
+def start_http_exporter(port, registry=REGISTRY, host='127.0.0.1'):
+    # Serve the registry on http://host:port/metrics from a daemon thread
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] not in ('/metrics', '/'):
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name='metrics-exporter', daemon=True).start()
+    return server
+
+
+def exporters_from_environment(registry=REGISTRY):
+    # File and/or HTTP exporters configured by APP_METRICS_FILE and APP_METRICS_PORT.
+    # Returns (file exporter or None, HTTP server or None); a port already in use (e.g. by the
+    # other app in the same host) leaves the HTTP exporter off rather than failing the app.
+    path = os.environ.get('APP_METRICS_FILE')
+    port = os.environ.get('APP_METRICS_PORT')
+    file_exporter = FileExporter(path, registry) if path else None
+    server = None
+    if port:
+        try:
+            server = start_http_exporter(int(port), registry)
+        except OSError:
+            server = None
+    return file_exporter, server
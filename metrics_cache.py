@@ -0,0 +1,76 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from innovation_metrics import INPUT_COLUMNS, score_frame
+
+
+def input_hash(values):
+    # Content hash of one innovation's numeric inputs (in INPUT_COLUMNS order)
+    return hashlib.blake2b(np.asarray(values, dtype=np.float64).tobytes(), digest_size=16).hexdigest()
+
+
+class MetricsCache:
+    # LRU cache of scored metric rows keyed by the content hash of the numeric inputs,
+    # so derived metrics are only recomputed for ideas whose inputs changed
+
+    def __init__(self, max_entries=100_000):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._columns = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def score(self, df):
+        # Scored metrics for every row of `df` (same index), computing only the cache misses
+        inputs = df[INPUT_COLUMNS].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        keys = [input_hash(row) for row in inputs]
+
+        rows = [None] * len(keys)
+        missing = []
+        with self._lock:
+            for position, key in enumerate(keys):
+                entry = self._entries.get(key)
+                if entry is None:
+                    missing.append(position)
+                else:
+                    self._entries.move_to_end(key)
+                    rows[position] = entry
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            # Score every miss in one vectorized call
+            scored = score_frame(pd.DataFrame(inputs[missing], columns=INPUT_COLUMNS))
+            fresh = list(scored.itertuples(index=False, name=None))
+            with self._lock:
+                self._columns = list(scored.columns)
+                for position, entry in zip(missing, fresh):
+                    rows[position] = entry
+                    self._entries[keys[position]] = entry
+                    self._entries.move_to_end(keys[position])
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        if self._columns is None:
+            return score_frame(df.iloc[:0])
+        return pd.DataFrame(rows, index=df.index, columns=self._columns)
+
+    def invalidate(self, values):
+        # Drop the cached metrics for one set of numeric inputs
+        with self._lock:
+            self._entries.pop(input_hash(values), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries), 'max_entries': self.max_entries}
@@ -0,0 +1,106 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import date, datetime
+
+import pandas as pd
+
+# Location of the shared on-disk database (override with the INNOVATION_APP_DB environment variable)
+DEFAULT_DB_PATH = os.environ.get('INNOVATION_APP_DB', 'innovation_app.db')
+
+# Every table is an append-only log: a record is never updated in place, a newer
+# version is appended instead and readers take the latest version per key
+TABLES = {
+    'innovation_inputs': 'innovation_id',
+    'innovation_metrics': 'innovation_id',
+    'productivity_improvements': 'entry_id',
+    'action_items': 'item_id',
+    'plant_hierarchy': 'plant',
+}
+
+
+def _to_json(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if hasattr(value, 'item'):
+        # NumPy scalars
+        return value.item()
+    return str(value)
+
+
+class DataStore:
+    # Embedded SQLite backend shared by every session of both apps
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        with self._conn:
+            for table, key in TABLES.items():
+                self._conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} ("
+                    f"seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+                    f"{key} TEXT NOT NULL, "
+                    f"record TEXT NOT NULL, "
+                    f"recorded_at TEXT NOT NULL)")
+                self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_key ON {table} ({key}, seq)")
+
+    def append(self, table, key, record):
+        # Append one new version of a record
+        self.append_many(table, [(key, record)])
+
+    def append_many(self, table, items):
+        # Append several (key, record) versions in a single transaction
+        key_column = TABLES[table]
+        now = datetime.now().isoformat()
+        rows = [(str(key), json.dumps(record, default=_to_json), now) for key, record in items]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT INTO {table} ({key_column}, record, recorded_at) VALUES (?, ?, ?)", rows)
+
+    def latest(self, table):
+        # Latest version of every record, as {key: record}, in first-insertion order
+        key_column = TABLES[table]
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT t.{key_column}, t.record FROM {table} t "
+                f"JOIN (SELECT {key_column}, MAX(seq) AS seq, MIN(seq) AS first FROM {table} GROUP BY {key_column}) l "
+                f"ON t.seq = l.seq ORDER BY l.first").fetchall()
+        return {key: json.loads(record) for key, record in rows}
+
+    def load_frame(self, table):
+        # Latest records as a DataFrame indexed by key
+        records = self.latest(table)
+        frame = pd.DataFrame.from_dict(records, orient='index')
+        frame.index.name = TABLES[table]
+        return frame
+
+    def count(self, table):
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(DISTINCT {TABLES[table]}) FROM {table}").fetchone()[0]
+
+    def export_table(self, table, path_or_buffer, file_format='csv'):
+        # Bulk export of the latest records to CSV or Parquet
+        frame = self.load_frame(table)
+        if file_format == 'parquet':
+            frame.to_parquet(path_or_buffer)
+        else:
+            frame.to_csv(path_or_buffer)
+
+    def import_table(self, table, path_or_buffer, file_format='csv', prepare=None):
+        # Bulk import from CSV or Parquet; the first column (or the index) holds the record key.
+        # `prepare` may normalise or validate the frame (raising to reject it) before anything is written.
+        if file_format == 'parquet':
+            frame = pd.read_parquet(path_or_buffer)
+        else:
+            frame = pd.read_csv(path_or_buffer, index_col=0, keep_default_na=False)
+        if prepare is not None:
+            frame = prepare(frame)
+        records = frame.to_dict(orient='index')
+        self.append_many(table, records.items())
+        return len(records)
+
+    def close(self):
+        self._conn.close()
@@ -1,20 +1,37 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
 from datetime import datetime, timedelta
+import os
+import uuid
+
+from chart_cache import ChartCache
+from instrumentation import RerunTimer, exporters_from_environment, timed
+from persistence import DataStore
+from plant_rollup import DEFAULT_ORGANIZATION, EMPTY_PRODUCTION, AggregationEngine
+from status_rules import anomalies, classify_frame, overdue_mask
+from telemetry import FileTailSource, TelemetryIngestor
+
+# Per-section timing of every script run, exported when APP_METRICS_FILE / APP_METRICS_PORT is set
+@st.cache_resource
+def get_metrics_exporters():
+    return exporters_from_environment()
+
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+timer = RerunTimer('plant', st.session_state.session_id, exporter=get_metrics_exporters()[0])
 
 # Data structure for production metrics
 production_data = {
     'Metric': ['Production Output', 'Production Costs', 'Raw Material Turnover', 'Production Waste (kg)', 'Energy Consumption (kWh)', 'Product A Output', 'Product B Output', 'Product C Output', 'Product D Output', 'Product E Output', 'Product Quality (Defects)', 'Safety Incidents'],
     'Target': [10000, 50000, 1000, 50, 2000, 2000, 2000, 2000, 2000, 2000, 5, 0],
     'Actual': [9500, 52000, 1100, 60, 2100, 1800, 1900, 2000, 1950, 1850, 7, 1],
-    'Status': ['Delayed', 'Issue', 'On Track', 'Issue', 'Issue', 'On Track', 'Delayed', 'On Track', 'On Track', 'Delayed', 'Issue', 'Issue'],
     'Problem Area': ['Downtime', 'Increased material costs', 'Inventory management', 'Waste reduction needed', 'Energy usage high', 'Production inefficiencies', 'Material shortages', 'Stable output', 'Stable output', 'Stable output', 'Increased defects', 'Safety protocols'],
     'Potential Solution': ['Preventive maintenance', 'Cost control initiatives', 'Better inventory management', 'Implement waste reduction', 'Energy-saving technologies', 'Improve machine efficiency', 'Improve material availability', 'Monitor closely', 'Monitor closely', 'Monitor closely', 'Enhanced QA processes', 'Staff safety training']
 }
 
-# Convert to DataFrame
+# Convert to DataFrame, deriving each metric's Status from Target vs Actual
 df = pd.DataFrame(production_data)
+df.insert(3, 'Status', classify_frame(df))
 
 # Data for productivity improvements
 productivity_data = {
@@ -25,7 +42,26 @@ productivity_data = {
     'Status': [],
 }
 
-prod_df = pd.DataFrame(productivity_data)
+# Shared on-disk database, opened once per server process
+@st.cache_resource
+def get_datastore():
+    return DataStore()
+
+db = get_datastore()
+
+def load_dated_frame(table, columns):
+    # Load the latest saved records of a table, restoring 'Due Date' to a date
+    frame = db.load_frame(table)
+    if frame.empty:
+        return pd.DataFrame({column: [] for column in columns})
+    frame = frame.reset_index(drop=True)[columns]
+    frame['Due Date'] = pd.to_datetime(frame['Due Date']).dt.date
+    return frame
+
+# Productivity improvements are loaded from disk once per session and kept in session state
+if 'prod_df' not in st.session_state:
+    st.session_state.prod_df = load_dated_frame('productivity_improvements', list(productivity_data))
+prod_df = st.session_state.prod_df
 
 # Sample action item tracking
 action_data = {
@@ -36,7 +72,12 @@ action_data = {
     'Projected Benefit': ['Increased uptime', 'Lower costs', 'Fewer incidents', 'Better product consistency'],
 }
 
-action_df = pd.DataFrame(action_data)
+# Seed the sample action items the first time the database is used
+if db.count('action_items') == 0:
+    db.append_many('action_items', enumerate(pd.DataFrame(action_data).to_dict(orient='records')))
+if 'action_df' not in st.session_state:
+    st.session_state.action_df = load_dated_frame('action_items', list(action_data))
+action_df = st.session_state.action_df
 
 # Sample Monthly Data for Visualizations (dummy data)
 months = ['January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September', 'October', 'November', 'December']
@@ -47,15 +88,155 @@ monthly_energy = [450, 500, 520, 480, 550, 540, 600, 620, 580, 600, 610, 630]
 monthly_defects = [5, 4, 3, 6, 7, 3, 2, 4, 5, 3, 2, 4]
 monthly_safety_incidents = [2, 0, 1, 2, 1, 3, 0, 1, 0, 2, 1, 0]
 
+sample_monthly_df = pd.DataFrame({
+    'output': monthly_production,
+    'costs': monthly_production_costs,
+    'raw_material_turnover': monthly_raw_material_turnover,
+    'energy': monthly_energy,
+    'defects': monthly_defects,
+    'safety_incidents': monthly_safety_incidents,
+}, index=months)
+
+# Plant shown when no telemetry is configured
+DEFAULT_PLANT = 'Main Plant'
+
+# Live plant telemetry (JSON-lines file named by PLANT_TELEMETRY_PATH), folded incrementally per period
+TELEMETRY_PATH = os.environ.get('PLANT_TELEMETRY_PATH')
+TELEMETRY_REFRESH_SECONDS = 5
+
+@st.cache_resource
+def get_telemetry(path):
+    return TelemetryIngestor(FileTailSource(path))
+
+telemetry = get_telemetry(TELEMETRY_PATH) if TELEMETRY_PATH else None
+
+# Which production metric each telemetry field feeds
+TELEMETRY_METRICS = {
+    'output': 'Production Output',
+    'costs': 'Production Costs',
+    'raw_material_turnover': 'Raw Material Turnover',
+    'waste': 'Production Waste (kg)',
+    'energy': 'Energy Consumption (kWh)',
+    'defects': 'Product Quality (Defects)',
+    'safety_incidents': 'Safety Incidents',
+}
+
+def monthly_series(plant, poll=True):
+    # Rolling per-period totals for the plant, or the sample data when no telemetry has arrived
+    if telemetry is None:
+        return sample_monthly_df
+    if poll:
+        telemetry.poll()
+    series = telemetry.aggregator.series(plant)
+    return sample_monthly_df if series.empty else series
+
+def plant_production_frame(series):
+    # Production metrics table with Actuals taken from the latest period of a plant's live series
+    if series is sample_monthly_df:
+        return df
+    latest = series.iloc[-1]
+    metrics_df = df.copy()
+    metrics_df['Actual'] = metrics_df['Actual'].astype(float)
+    for field, metric in TELEMETRY_METRICS.items():
+        metrics_df.loc[metrics_df['Metric'] == metric, 'Actual'] = latest[field]
+    metrics_df['Status'] = classify_frame(metrics_df)
+    return metrics_df
+
+timer.mark('load_data')
+
 # Title and description
 st.title("Production Plant Health Check and Productivity Improvement Dashboard")
 st.write("""
 This dashboard tracks key performance metrics, identifies problem areas, tracks productivity improvement initiatives, and helps plant managers manage tasks with action items, deadlines, and potential benefits.
 """)
 
-# Display production metrics
-st.write("### Production Metrics")
-st.data_editor(df, use_container_width=True)
+selected_plant = DEFAULT_PLANT
+if telemetry is not None:
+    telemetry.poll()
+    plants = telemetry.aggregator.plants()
+    if plants:
+        selected_plant = st.sidebar.selectbox("Plant", plants)
+    st.sidebar.caption(f"Telemetry records ingested: {telemetry.records_ingested}")
+
+# Display production metrics, refreshed from telemetry on a timer
+@st.fragment(run_every=TELEMETRY_REFRESH_SECONDS if telemetry is not None else None)
+@timed('plant', 'production_metrics')
+def production_metrics_section():
+    st.write("### Production Metrics")
+    series = monthly_series(selected_plant)
+    if series is not sample_monthly_df:
+        st.caption(f"Live totals for {selected_plant}, period {series.index[-1]}")
+    st.data_editor(plant_production_frame(series), use_container_width=True)
+
+production_metrics_section()
+
+# Organization Rollup: per-plant metrics computed in parallel and summed per organization
+@st.cache_resource
+def get_aggregation_engine():
+    return AggregationEngine()
+
+engine = get_aggregation_engine()
+
+@st.cache_data(ttl=30)
+def load_innovations():
+    return db.load_frame('innovation_inputs')
+
+@st.fragment(run_every=TELEMETRY_REFRESH_SECONDS if telemetry is not None else None)
+@timed('plant', 'organization_rollup')
+def organization_rollup_section():
+    st.write("### Organization Rollup")
+    engine.assign_organizations(
+        {plant: record['Organization'] for plant, record in db.latest('plant_hierarchy').items()})
+
+    innovations = load_innovations()
+    if 'Plant' in innovations:
+        innovations_by_plant = dict(tuple(innovations.groupby('Plant')))
+    else:
+        innovations_by_plant = {}
+    empty_innovations = innovations.iloc[:0]
+
+    if telemetry is not None:
+        telemetry.poll()
+        production_plants = set(telemetry.aggregator.plants())
+    else:
+        production_plants = {DEFAULT_PLANT}
+    organizations = set(engine.organizations())
+    # Plants known only from innovation records have no production figures of their own
+    plants = sorted(production_plants | {plant for plant in innovations_by_plant if plant not in organizations})
+
+    for plant in plants:
+        if plant in production_plants:
+            production = plant_production_frame(monthly_series(plant, poll=False))
+        else:
+            production = EMPTY_PRODUCTION
+        engine.update_plant(plant, production, innovations_by_plant.get(plant, empty_innovations))
+    # Plants whose last innovation moved elsewhere (and that have no production data) drop out
+    for plant in set(engine.plants()) - set(plants):
+        engine.remove_plant(plant)
+    # Innovations recorded against an organization rather than a plant count towards its totals directly
+    for organization in organizations:
+        if organization in innovations_by_plant:
+            engine.update_organization(organization, innovations_by_plant[organization])
+        else:
+            engine.remove_organization(organization)
+    engine.refresh()
+
+    st.write("#### Organization Totals")
+    st.dataframe(engine.organization_table(), use_container_width=True)
+    st.write("#### Per-Plant Metrics")
+    st.dataframe(engine.plant_table(), use_container_width=True)
+
+    with st.form("plant_hierarchy_form"):
+        hierarchy_plant = st.selectbox("Plant", plants)
+        hierarchy_organization = st.text_input("Organization", value=DEFAULT_ORGANIZATION)
+        if st.form_submit_button("Assign Plant to Organization"):
+            # The next refresh moves the plant's figures to its new organization
+            db.append('plant_hierarchy', hierarchy_plant, {'Organization': hierarchy_organization})
+            st.rerun()
+
+organization_rollup_section()
+
+timer.mark('production_metrics_and_rollup')
 
 # Productivity Improvement Section
 st.write("### Productivity Improvement")
@@ -78,8 +259,10 @@ with st.form("productivity_form"):
             'Assigned User': assigned_user,
             'Status': action_status
         }
-        # Use pd.concat instead of append
+        # Append the entry on disk, then to the in-session copy
+        db.append('productivity_improvements', uuid.uuid4().hex, new_prod_entry)
         prod_df = pd.concat([prod_df, pd.DataFrame([new_prod_entry])], ignore_index=True)
+        st.session_state.prod_df = prod_df
         st.success("New productivity improvement data added successfully!")
 
 # Display Productivity Improvement Data
@@ -88,9 +271,19 @@ st.data_editor(prod_df, use_container_width=True)
 
 # Send Alert Notifications (dummy for now, could be linked to email or messaging service)
 st.write("#### Alert Notifications")
-for index, row in prod_df.iterrows():
-    if row['Due Date'] <= datetime.now().date() and row['Status'] != 'Completed':
-        st.warning(f"Action '{row['Training Needs']}' assigned to {row['Assigned User']}' is overdue!")
+overdue_prod = prod_df[overdue_mask(prod_df['Due Date'], prod_df['Status'])]
+overdue_actions = action_df[overdue_mask(action_df['Due Date'], action_df['Status'])]
+if len(overdue_prod) <= 10:
+    for training_needs_item, assigned in zip(overdue_prod['Training Needs'], overdue_prod['Assigned User']):
+        st.warning(f"Action '{training_needs_item}' assigned to {assigned}' is overdue!")
+else:
+    st.warning(f"{len(overdue_prod)} productivity improvements are overdue!")
+    st.dataframe(overdue_prod, use_container_width=True)
+if len(overdue_actions):
+    st.warning(f"{len(overdue_actions)} action items are overdue!")
+    st.dataframe(overdue_actions, use_container_width=True)
+
+timer.mark('productivity_and_alerts')
 
 # Action Item Tracker Section
 st.write("### Action Item Tracker")
@@ -119,46 +312,79 @@ benefits = [
 ]
 benefits_input = st.text_area("Edit Projected Benefits", "\n".join(benefits), height=100)
 
+timer.mark('action_items_dashboard')
+
 # --- New Visualizations ---
 
-# 1. Monthly Production Output Trend (Line Chart)
-st.write("### Monthly Production Output Trend")
-fig1, ax1 = plt.subplots()
-ax1.plot(months, monthly_production, marker='o', linestyle='-', color='blue', label='Production Output')
-ax1.plot(months, monthly_production_costs, marker='o', linestyle='-', color='green', label='Production Costs')
-ax1.plot(months, monthly_raw_material_turnover, marker='o', linestyle='-', color='purple', label='Raw Material Turnover')
-ax1.set_title("Monthly Production Output, Costs, and Raw Material Turnover")
-ax1.set_xlabel("Month")
-ax1.set_ylabel("Value")
-ax1.legend()
-st.pyplot(fig1)
-
-# 2. Energy Consumption vs Production Output (Scatter Plot)
-st.write("### Energy Consumption vs Production Output")
-fig2, ax2 = plt.subplots()
-ax2.scatter(monthly_energy, monthly_production, color='green')
-ax2.set_title("Energy Consumption vs Production Output")
-ax2.set_xlabel("Energy Consumption (kWh)")
-ax2.set_ylabel("Production Output")
-st.pyplot(fig2)
-
-# 3. Defects and Safety Incidents Over Time (Bar Chart)
-st.write("### Defects and Safety Incidents Over Time")
-fig3, ax3 = plt.subplots()
-ax3.bar(months, monthly_defects, width=0.4, label="Defects", color='red', align='center')
-ax3.bar(months, monthly_safety_incidents, width=0.4, label="Safety Incidents", color='orange', align='edge')
-ax3.set_title("Monthly Defects and Safety Incidents")
-ax3.set_xlabel("Month")
-ax3.set_ylabel("Count")
-ax3.legend()
-st.pyplot(fig3)
+# Rendered chart images are cached per server process, keyed by the data they plot
+@st.cache_resource
+def get_chart_cache():
+    return ChartCache()
+
+chart_cache = get_chart_cache()
+
+def draw_production_trend(ax, months, production, costs, raw_material_turnover):
+    ax.plot(months, production, marker='o', linestyle='-', color='blue', label='Production Output')
+    ax.plot(months, costs, marker='o', linestyle='-', color='green', label='Production Costs')
+    ax.plot(months, raw_material_turnover, marker='o', linestyle='-', color='purple', label='Raw Material Turnover')
+    ax.set_title("Monthly Production Output, Costs, and Raw Material Turnover")
+    ax.set_xlabel("Month")
+    ax.set_ylabel("Value")
+    ax.legend()
+
+def draw_energy_vs_output(ax, energy, production):
+    ax.scatter(energy, production, color='green')
+    ax.set_title("Energy Consumption vs Production Output")
+    ax.set_xlabel("Energy Consumption (kWh)")
+    ax.set_ylabel("Production Output")
+
+def draw_defects_and_incidents(ax, months, defects, safety_incidents):
+    ax.bar(months, defects, width=0.4, label="Defects", color='red', align='center')
+    ax.bar(months, safety_incidents, width=0.4, label="Safety Incidents", color='orange', align='edge')
+    ax.set_title("Monthly Defects and Safety Incidents")
+    ax.set_xlabel("Month")
+    ax.set_ylabel("Count")
+    ax.legend()
+
+def draw_action_status(ax, open_items, in_progress_items, completed_items):
+    ax.pie([open_items, in_progress_items, completed_items], 
+           labels=['Open', 'In Progress', 'Completed'], 
+           autopct='%1.1f%%', 
+           colors=['orange', 'blue', 'green'])
+    ax.set_title("Action Items Status Distribution")
+
+@st.fragment(run_every=TELEMETRY_REFRESH_SECONDS if telemetry is not None else None)
+@timed('plant', 'monthly_charts')
+def monthly_charts_section():
+    series = monthly_series(selected_plant)
+    periods = tuple(series.index)
+
+    # 1. Monthly Production Output Trend (Line Chart)
+    st.write("### Monthly Production Output Trend")
+    st.image(chart_cache.render(draw_production_trend, periods, tuple(series['output']),
+                                tuple(series['costs']), tuple(series['raw_material_turnover'])))
+
+    # 2. Energy Consumption vs Production Output (Scatter Plot)
+    st.write("### Energy Consumption vs Production Output")
+    st.image(chart_cache.render(draw_energy_vs_output, tuple(series['energy']), tuple(series['output'])))
+
+    # 3. Defects and Safety Incidents Over Time (Bar Chart)
+    st.write("### Defects and Safety Incidents Over Time")
+    st.image(chart_cache.render(draw_defects_and_incidents, periods, tuple(series['defects']), tuple(series['safety_incidents'])))
+
+    # Periods that deviate sharply from the recent trend
+    st.write("### Anomalies in Monthly Series")
+    flagged = anomalies(series.drop(columns='records', errors='ignore'))
+    if flagged.empty:
+        st.info("No anomalies detected in the monthly series.")
+    else:
+        st.dataframe(flagged, use_container_width=True)
+
+monthly_charts_section()
 
 # Visualization for Action Items Status
 st.write("### Action Items Status Distribution")
-fig, ax = plt.subplots()
-ax.pie([open_items, in_progress_items, completed_items], 
-       labels=['Open', 'In Progress', 'Completed'], 
-       autopct='%1.1f%%', 
-       colors=['orange', 'blue', 'green'])  # Added the closing of colors list and parentheses
-ax.set_title("Action Items Status Distribution")
-st.pyplot(fig)
+st.image(chart_cache.render(draw_action_status, open_items, in_progress_items, completed_items))
+
+timer.mark('charts')
+timer.finish()
@@ -0,0 +1,213 @@
+import threading
+
+import pandas as pd
+
+from innovation_metrics import INPUT_COLUMNS, score_frame
+from process_pool import shared_executor
+
+DEFAULT_ORGANIZATION = 'Organization'
+
+STATUSES = ['On Track', 'Delayed', 'Issue']
+
+# Production metrics table of a plant (or organization) with no production data
+EMPTY_PRODUCTION = pd.DataFrame({'Metric': pd.Series(dtype=object), 'Target': pd.Series(dtype=float),
+                                 'Actual': pd.Series(dtype=float), 'Status': pd.Series(dtype=object)})
+
+
+class PlantHierarchy:
+    # Maps each plant to the organization it belongs to
+
+    def __init__(self, organization_of=None):
+        self.organization_of = dict(organization_of or {})
+
+    def add(self, plant, organization=DEFAULT_ORGANIZATION):
+        self.organization_of[plant] = organization
+
+    def organization(self, plant):
+        return self.organization_of.get(plant, DEFAULT_ORGANIZATION)
+
+    def organizations(self):
+        return sorted(set(self.organization_of.values()) | {DEFAULT_ORGANIZATION})
+
+
+def plant_metrics(production, innovations):
+    # Additive per-plant figures: Target/Actual totals and status counts from the production
+    # metrics table, plus innovation counts and totals from the plant's innovation records.
+    # Every value is a plain number, so organization rollups are simple sums.
+    result = {}
+    for metric, target, actual in zip(production['Metric'], production['Target'], production['Actual']):
+        result[f"{metric} Target"] = float(target)
+        result[f"{metric} Actual"] = float(actual)
+    for status in STATUSES:
+        result[status] = int((production['Status'] == status).sum())
+
+    result['Innovations'] = len(innovations)
+    if len(innovations):
+        scored = score_frame(innovations)
+        numeric = innovations[INPUT_COLUMNS].apply(pd.to_numeric, errors='coerce')
+        result['Innovations Meeting Conditions'] = int(scored['Conditions Met'].sum())
+        result['Cash Generation (in $)'] = float(scored['Cash Generation (in $)'].sum())
+        result['Net Operating Profit After Taxes'] = float(numeric['Net Operating Profit After Taxes'].sum())
+        result['Invested Capital (Market Value)'] = float(numeric['Invested Capital (Market Value)'].sum())
+    else:
+        result['Innovations Meeting Conditions'] = 0
+        result['Cash Generation (in $)'] = 0.0
+        result['Net Operating Profit After Taxes'] = 0.0
+        result['Invested Capital (Market Value)'] = 0.0
+    return result
+
+
+def _plant_metrics_job(job):
+    key, production, innovations = job
+    return key, plant_metrics(production, innovations)
+
+
+def _data_hash(frame):
+    return int(pd.util.hash_pandas_object(frame, index=False).sum()) if len(frame) else 0
+
+
+class AggregationEngine:
+    # Keeps per-plant metrics and incrementally maintained organization totals.
+    # Changed plants are recomputed together in refresh(), across a process pool when
+    # enough plants changed at once to outweigh the cost of shipping the data to workers.
+    # Innovations recorded against an organization itself (update_organization) count
+    # towards that organization's totals but not as a plant.
+
+    def __init__(self, hierarchy=None, max_workers=None, parallel_threshold=16):
+        self.hierarchy = hierarchy if hierarchy is not None else PlantHierarchy()
+        self.max_workers = max_workers
+        self.parallel_threshold = parallel_threshold
+        self.plant_results = {}
+        self.organization_totals = {}
+        self._results = {}  # ('plant' | 'organization', name) -> (organization added to, result)
+        self._entries = {}  # organization -> number of results added to it
+        self._input_hashes = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def assign_organizations(self, organization_of):
+        # Apply {plant: organization} assignments; moved plants follow on the next refresh()
+        with self._lock:
+            self.hierarchy.organization_of.update(organization_of)
+
+    def organizations(self):
+        with self._lock:
+            return self.hierarchy.organizations()
+
+    def plants(self):
+        # Plants with a computed or queued result
+        with self._lock:
+            return sorted({name for kind, name in list(self._results) + list(self._pending) if kind == 'plant'})
+
+    def update_plant(self, plant, production, innovations):
+        # Queue a plant for recomputation if its data changed since the last refresh
+        return self._queue(('plant', plant), production, innovations)
+
+    def update_organization(self, organization, innovations):
+        # Queue the innovations recorded directly against an organization
+        return self._queue(('organization', organization), EMPTY_PRODUCTION, innovations)
+
+    def remove_plant(self, plant):
+        with self._lock:
+            self._remove(('plant', plant))
+
+    def remove_organization(self, organization):
+        with self._lock:
+            self._remove(('organization', organization))
+
+    def refresh(self):
+        # Move results whose plant was reassigned since they were added, recompute the queued
+        # plants and fold the differences into the organization totals
+        with self._lock:
+            for key, (organization, result) in list(self._results.items()):
+                if self._organization_for(key) != organization:
+                    self._subtract(key)
+                    self._add(key, result)
+            jobs = [(key, production, innovations) for key, (production, innovations) in self._pending.items()]
+            self._pending.clear()
+        if not jobs:
+            return 0
+
+        if len(jobs) >= self.parallel_threshold:
+            results = list(shared_executor(self.max_workers).map(_plant_metrics_job, jobs,
+                                                                 chunksize=max(1, len(jobs) // 32)))
+        else:
+            results = [_plant_metrics_job(job) for job in jobs]
+
+        with self._lock:
+            for key, result in results:
+                self._subtract(key)
+                self._add(key, result)
+        return len(results)
+
+    def plant_table(self):
+        with self._lock:
+            table = pd.DataFrame.from_dict(self.plant_results, orient='index')
+            organizations = {name: organization for (kind, name), (organization, _) in self._results.items()
+                             if kind == 'plant'}
+        if table.empty:
+            return table
+        table.insert(0, 'Organization', [organizations[plant] for plant in table.index])
+        return _with_ratios(table.sort_index())
+
+    def organization_table(self):
+        with self._lock:
+            table = pd.DataFrame.from_dict(self.organization_totals, orient='index')
+        return table if table.empty else _with_ratios(table.sort_index())
+
+    def _queue(self, key, production, innovations):
+        signature = (_data_hash(production), _data_hash(innovations))
+        with self._lock:
+            if self._input_hashes.get(key) == signature and key in self._results:
+                return False
+            self._input_hashes[key] = signature
+            self._pending[key] = (production, innovations)
+            return True
+
+    def _remove(self, key):
+        self._pending.pop(key, None)
+        self._input_hashes.pop(key, None)
+        self._subtract(key)
+
+    def _organization_for(self, key):
+        kind, name = key
+        return name if kind == 'organization' else self.hierarchy.organization(name)
+
+    def _add(self, key, result):
+        organization = self._organization_for(key)
+        self._results[key] = (organization, result)
+        if key[0] == 'plant':
+            self.plant_results[key[1]] = result
+        self._entries[organization] = self._entries.get(organization, 0) + 1
+        self._add_to_organization(organization, result, sign=1, plants=int(key[0] == 'plant'))
+
+    def _subtract(self, key):
+        # Take a result out of the organization it was added to, dropping emptied organizations
+        previous = self._results.pop(key, None)
+        if previous is None:
+            return
+        organization, result = previous
+        if key[0] == 'plant':
+            self.plant_results.pop(key[1], None)
+        self._entries[organization] -= 1
+        if self._entries[organization] == 0:
+            del self._entries[organization]
+            self.organization_totals.pop(organization, None)
+        else:
+            self._add_to_organization(organization, result, sign=-1, plants=int(key[0] == 'plant'))
+
+    def _add_to_organization(self, organization, result, sign, plants):
+        totals = self.organization_totals.setdefault(organization, {'Plants': 0})
+        for key, value in result.items():
+            totals[key] = totals.get(key, 0) + sign * value
+        totals['Plants'] += sign * plants
+
+
+def _with_ratios(table):
+    # Non-additive figures derived from the summed columns
+    capital = table['Invested Capital (Market Value)']
+    table['ROIC (%)'] = (table['Net Operating Profit After Taxes'] / capital.where(capital != 0)) * 100
+    if 'Production Output Target' in table:
+        target = table['Production Output Target']
+        table['Output Attainment (%)'] = (table['Production Output Actual'] / target.where(target != 0)) * 100
+    return table
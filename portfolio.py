@@ -0,0 +1,98 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from innovation_metrics import INPUT_COLUMNS, score_arrays, score_frame
+from process_pool import shared_executor
+
+# Yes/No resource, value, cost and process fields; each 'Yes' counts towards alignment
+ALIGNMENT_COLUMNS = [
+    'Sales Team Availability',
+    'Distribution Network Readiness',
+    'Value 1 Alignment',
+    'Value 2 Alignment',
+    'Value 3 Alignment',
+    'Cost Feasibility',
+    'Process Capability',
+]
+
+# Ranking criteria and their weight in the composite score
+RANKING_WEIGHTS = {
+    'ROIC (%)': 0.3,
+    'Cash Generation (in $)': 0.3,
+    'Contribution to Gross Margin (%)': 0.2,
+    'Alignment Score': 0.2,
+}
+
+# Default sweep: relative half-width of the uniform range sampled for each input
+DEFAULT_RANGES = {
+    'Sales After Innovation': 0.20,
+    'Incremental Capital Expenditure': 0.30,
+}
+
+SWEEP_METRICS = ['ROIC (%)', 'Cash Generation (in $)', 'Contribution to Gross Margin (%)']
+
+
+def rank_portfolio(frame, weights=RANKING_WEIGHTS):
+    # Rank every innovation by a weighted mean of its percentile rank on each criterion.
+    # Metrics that cannot be computed rank last on that criterion.
+    scored = score_frame(frame)
+    ranking = scored[[column for column in weights if column in scored.columns]].copy()
+    ranking['Alignment Score'] = (frame[ALIGNMENT_COLUMNS] == 'Yes').mean(axis=1) * 100
+
+    percentiles = ranking[list(weights)].rank(pct=True, na_option='bottom')
+    ranking['Composite Score'] = (percentiles * pd.Series(weights)).sum(axis=1) / sum(weights.values()) * 100
+    ranking['Conditions Met'] = scored['Conditions Met']
+    ranking = ranking.sort_values('Composite Score', ascending=False)
+    ranking.insert(0, 'Rank', np.arange(1, len(ranking) + 1))
+    return ranking
+
+
+def _sweep_chunk(job):
+    # Monte Carlo over one chunk of ideas: `base` is (ideas, inputs); every varied input is
+    # scaled by an independent uniform multiplier per sample
+    base, ranges, samples, metrics, percentiles, seed = job
+    rng = np.random.default_rng(seed)
+    inputs = {name: base[:, [position]] for position, name in enumerate(INPUT_COLUMNS)}
+    for name, spread in ranges.items():
+        multipliers = rng.uniform(1 - spread, 1 + spread, size=(base.shape[0], samples))
+        inputs[name] = inputs[name] * multipliers
+    values, _, _ = score_arrays(inputs)
+
+    out = []
+    for metric in metrics:
+        sampled = values[metric]
+        if sampled.shape[1] == 1:
+            # The metric does not depend on any varied input: every percentile is the base value
+            bands = np.repeat(sampled[:, :1], len(percentiles), axis=1)
+        else:
+            with warnings.catch_warnings():
+                # Ideas whose metric is never computable yield all-NaN bands
+                warnings.simplefilter('ignore', RuntimeWarning)
+                bands = np.nanpercentile(sampled, percentiles, axis=1).T
+        out.append(bands)
+    return np.concatenate(out, axis=1)
+
+
+def monte_carlo(frame, ranges=DEFAULT_RANGES, samples=10_000, metrics=SWEEP_METRICS,
+                percentiles=(5, 50, 95), seed=None, max_workers=None, chunk_elements=2_000_000):
+    # Percentile bands of each metric per innovation under random perturbation of its inputs.
+    # Ideas are processed in chunks of about `chunk_elements` samples, across a process pool
+    # when there is more than one chunk.
+    if samples < 1:
+        raise ValueError("samples must be at least 1")
+    base = frame[INPUT_COLUMNS].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    ideas_per_chunk = max(1, chunk_elements // max(samples, 1))
+    seeds = np.random.SeedSequence(seed).spawn(max(1, -(-len(base) // ideas_per_chunk)))
+    jobs = [(base[start:start + ideas_per_chunk], dict(ranges), samples, list(metrics), list(percentiles), seeds[number])
+            for number, start in enumerate(range(0, len(base), ideas_per_chunk))]
+
+    if len(jobs) > 1 and (max_workers is None or max_workers > 1):
+        chunks = list(shared_executor(max_workers).map(_sweep_chunk, jobs))
+    else:
+        chunks = [_sweep_chunk(job) for job in jobs]
+
+    columns = [f"{metric} P{p:g}" for metric in metrics for p in percentiles]
+    values = np.concatenate(chunks) if chunks else np.empty((0, len(columns)))
+    return pd.DataFrame(values, index=frame.index, columns=columns)
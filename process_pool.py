@@ -0,0 +1,31 @@
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+_executors = {}  # max_workers -> executor
+_lock = threading.Lock()
+
+
+def shared_executor(max_workers=None):
+    # Process pool shared by every session, created on first use and kept for the life of the
+    # server process. Workers come from a forkserver rather than being forked from the server:
+    # Streamlit runs sessions on several threads, and a forked child inherits any lock another
+    # thread holds at that moment, which can deadlock it.
+    max_workers = max_workers or os.cpu_count()
+    with _lock:
+        executor = _executors.get(max_workers)
+        if executor is None:
+            executor = _executors[max_workers] = ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=multiprocessing.get_context('forkserver'))
+        return executor
+
+
+@atexit.register
+def shutdown_executors():
+    with _lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(cancel_futures=True)
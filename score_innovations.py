@@ -0,0 +1,174 @@
+"""Headless batch scoring of innovation inputs, using the same formulas as the Streamlit app.
+
+Usage:
+    python score_innovations.py inputs.csv scored.csv
+    python score_innovations.py inputs.parquet scored.jsonl --chunk-size 200000 --wacc 8
+    cat inputs.jsonl | python score_innovations.py - - --input-format jsonl --output-format csv
+
+Input files need the numeric input columns of innovation_metrics.INPUT_COLUMNS; any other
+columns are passed through unless --metrics-only is given. Rows are read, scored and written
+one chunk at a time, so memory stays bounded regardless of the file size.
+"""
+import argparse
+import os
+import sys
+
+import pandas as pd
+
+from innovation_metrics import INPUT_COLUMNS, format_critical_conditions, score_frame
+
+FORMATS = ['csv', 'jsonl', 'parquet']
+
+
+def detect_format(path, explicit=None):
+    if explicit:
+        return explicit
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    if extension in ('json', 'ndjson'):
+        return 'jsonl'
+    if extension in FORMATS:
+        return extension
+    raise ValueError(f"Cannot tell the format of '{path}'; pass --input-format/--output-format")
+
+
+def read_chunks(path, file_format, chunk_size):
+    # Yield DataFrames of at most `chunk_size` rows
+    source = sys.stdin if path == '-' else path
+    if file_format == 'csv':
+        # Pass-through columns stay text, so a column that is blank in one chunk has the same type in
+        # every chunk; input columns are parsed as numbers the way score_frame would coerce them
+        for chunk in pd.read_csv(source, chunksize=chunk_size, dtype=str, keep_default_na=False, na_values=['']):
+            for name in INPUT_COLUMNS:
+                if name in chunk:
+                    chunk[name] = pd.to_numeric(chunk[name], errors='coerce')
+            yield chunk
+    elif file_format == 'jsonl':
+        yield from pd.read_json(source, lines=True, chunksize=chunk_size)
+    else:
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(sys.stdin.buffer if path == '-' else path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+
+
+def score_chunk(chunk, wacc=0.0, metrics_only=False, conditions_text=False):
+    scored = score_frame(chunk, wacc=wacc)
+    if conditions_text:
+        scored['Critical Conditions'] = format_critical_conditions(scored)
+    return scored if metrics_only else pd.concat([chunk, scored], axis=1)
+
+
+class ChunkWriter:
+    # Appends scored chunks to a CSV, JSON-lines or Parquet output
+
+    def __init__(self, path, file_format):
+        self.path = path
+        self.file_format = file_format
+        self.rows = 0
+        self._parquet_writer = None
+        self._schema = None
+        self._columns = None
+        if file_format == 'parquet':
+            self._handle = None
+        elif path == '-':
+            self._handle = sys.stdout
+        else:
+            self._handle = open(path, 'w', newline='', encoding='utf-8')
+
+    def write(self, chunk):
+        chunk = self._conform(chunk)
+        if self.file_format == 'csv':
+            chunk.to_csv(self._handle, index=False, header=self.rows == 0)
+        elif self.file_format == 'jsonl':
+            text = chunk.to_json(orient='records', lines=True)
+            if text and not text.endswith('\n'):
+                text += '\n'
+            self._handle.write(text)
+        else:
+            import pyarrow.parquet as pq
+
+            table = self._parquet_table(chunk)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(sys.stdout.buffer if self.path == '-' else self.path, self._schema)
+            self._parquet_writer.write_table(table)
+        self.rows += len(chunk)
+
+    def _conform(self, chunk):
+        # The first chunk fixes the output columns (e.g. the CSV header); later chunks are reindexed
+        # to them, so keys missing from some JSON-lines records become blanks. A column first seen
+        # in a later chunk cannot be added to what was already written.
+        if self._columns is None:
+            self._columns = list(chunk.columns)
+            return chunk
+        extra = [column for column in chunk.columns if column not in self._columns]
+        if extra:
+            raise ValueError(f"Rows {self.rows + 1}-{self.rows + len(chunk)} have columns not in the first chunk "
+                             f"({', '.join(map(str, extra))}); try a larger --chunk-size")
+        return chunk.reindex(columns=self._columns)
+
+    def _parquet_table(self, chunk):
+        # Every row group must share the file schema: it is fixed by the first chunk (columns with
+        # no values there are stored as text), and later chunks are converted to it
+        import pyarrow as pa
+
+        if self._schema is None:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            self._schema = pa.schema([field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                                      for field in table.schema], metadata=table.schema.metadata)
+            return table.cast(self._schema)
+        try:
+            return pa.Table.from_pandas(chunk, schema=self._schema, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            raise ValueError(f"Rows {self.rows + 1}-{self.rows + len(chunk)} do not match the Parquet schema "
+                             f"of the first chunk ({e}); try a larger --chunk-size") from e
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+        if self._handle is not None and self._handle is not sys.stdout:
+            self._handle.close()
+        elif self._handle is sys.stdout:
+            sys.stdout.flush()
+
+
+def score_file(input_path, output_path, input_format=None, output_format=None, chunk_size=100_000,
+               wacc=0.0, metrics_only=False, conditions_text=False):
+    # Score every row of `input_path` into `output_path`; returns the number of rows written
+    input_format = detect_format(input_path, input_format)
+    output_format = detect_format(output_path, output_format)
+    writer = ChunkWriter(output_path, output_format)
+    try:
+        for chunk in read_chunks(input_path, input_format, chunk_size):
+            writer.write(score_chunk(chunk, wacc=wacc, metrics_only=metrics_only, conditions_text=conditions_text))
+    finally:
+        writer.close()
+    return writer.rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score innovation inputs without Streamlit.")
+    parser.add_argument('input', help="Input file (CSV, JSON-lines or Parquet), or '-' for stdin")
+    parser.add_argument('output', help="Output file (CSV, JSON-lines or Parquet), or '-' for stdout")
+    parser.add_argument('--input-format', choices=FORMATS, help="Input format (default: from the file extension)")
+    parser.add_argument('--output-format', choices=FORMATS, help="Output format (default: from the file extension)")
+    parser.add_argument('--chunk-size', type=int, default=100_000, help="Rows per chunk (default: 100000)")
+    parser.add_argument('--wacc', type=float, default=0.0, help="WACC in percent for the 'ROIC > WACC' condition (default: 0)")
+    parser.add_argument('--metrics-only', action='store_true', help="Write only the scored columns, not the inputs")
+    parser.add_argument('--conditions-text', action='store_true', help="Also write the human-readable 'Critical Conditions' column")
+    args = parser.parse_args(argv)
+
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    try:
+        rows = score_file(args.input, args.output, args.input_format, args.output_format, args.chunk_size,
+                          args.wacc, args.metrics_only, args.conditions_text)
+    except (KeyError, ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if args.output != '-':
+        print(f"Scored {rows} rows into {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+# Whether a metric is good when above its target ('higher') or below it ('lower').
+# Metrics not listed are treated as 'higher'.
+METRIC_DIRECTIONS = {
+    'Production Output': 'higher',
+    'Production Costs': 'lower',
+    'Raw Material Turnover': 'higher',
+    'Production Waste (kg)': 'lower',
+    'Energy Consumption (kWh)': 'lower',
+    'Product A Output': 'higher',
+    'Product B Output': 'higher',
+    'Product C Output': 'higher',
+    'Product D Output': 'higher',
+    'Product E Output': 'higher',
+    'Product Quality (Defects)': 'lower',
+    'Safety Incidents': 'lower',
+}
+
+# A metric missing its target by up to this fraction is 'Delayed'; beyond it, it is an 'Issue'
+DEFAULT_TOLERANCE = 0.10
+
+
+def shortfall(target, actual, higher_is_better):
+    # Fraction by which each actual misses its target in the bad direction (<= 0 means on target).
+    # With a zero target any miss counts as a full shortfall per unit.
+    target = np.asarray(target, dtype=np.float64)
+    actual = np.asarray(actual, dtype=np.float64)
+    miss = np.where(higher_is_better, target - actual, actual - target)
+    scale = np.abs(target)
+    return np.divide(miss, scale, out=miss.copy(), where=scale != 0)
+
+
+def classify(target, actual, higher_is_better, tolerance=DEFAULT_TOLERANCE):
+    # Vectorized 'On Track' / 'Delayed' / 'Issue' status for arrays of targets and actuals
+    miss = shortfall(target, actual, higher_is_better)
+    return np.select([miss <= 0, miss <= tolerance], ['On Track', 'Delayed'], default='Issue')
+
+
+def classify_frame(df, directions=METRIC_DIRECTIONS, tolerance=DEFAULT_TOLERANCE):
+    # Status for every row of a Metric / Target / Actual table
+    higher_is_better = df['Metric'].map(directions).fillna('higher').to_numpy() == 'higher'
+    return pd.Series(classify(df['Target'], df['Actual'], higher_is_better, tolerance), index=df.index)
+
+
+def rolling_zscores(series, window=6, min_periods=3):
+    # z-score of each period against the mean and spread of the preceding `window` periods.
+    # After a flat history (zero spread) any change scores +/-inf, e.g. the first incident in months.
+    history = series.shift(1).rolling(window, min_periods=min_periods)
+    std = history.std()
+    deviation = series - history.mean()
+    scores = deviation / std.where(std != 0)
+    return scores.mask((std == 0) & (deviation != 0), np.sign(deviation) * np.inf)
+
+
+def anomalies(series, window=6, threshold=2.5):
+    # Periods whose value lies more than `threshold` standard deviations from the recent mean,
+    # as a long table of period / field / value / z-score
+    scores = rolling_zscores(series, window=window)
+    flagged = scores.abs() > threshold
+    if not flagged.to_numpy().any():
+        return pd.DataFrame(columns=['Period', 'Field', 'Value', 'Z-Score'])
+    rows, columns = np.nonzero(flagged.to_numpy())
+    return pd.DataFrame({
+        'Period': series.index[rows],
+        'Field': series.columns[columns],
+        'Value': series.to_numpy()[rows, columns],
+        'Z-Score': scores.to_numpy()[rows, columns],
+    })
+
+
+def overdue_mask(due_dates, statuses, today=None, done_status='Completed'):
+    # True for every item due on or before today that is not done
+    today = pd.Timestamp(today if today is not None else date.today())
+    due = pd.to_datetime(pd.Series(due_dates), errors='coerce').dt.normalize()
+    return ((due <= today) & (pd.Series(statuses).to_numpy() != done_status)).to_numpy()
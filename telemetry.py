@@ -0,0 +1,142 @@
+import json
+import os
+import queue
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Numeric fields of a plant sensor / MES record, summed per period
+FIELDS = ['output', 'costs', 'raw_material_turnover', 'waste', 'energy', 'defects', 'safety_incidents']
+
+# A record is one JSON object per line, e.g.
+# {"plant": "Plant 1", "timestamp": "2024-05-03T10:15:00", "output": 12, "costs": 48.5, "energy": 3.1, ...}
+# Missing numeric fields count as 0; the period is the month of the timestamp ("YYYY-MM").
+
+
+class FileTailSource:
+    # Reads JSON-lines records appended to a local file, remembering the byte offset
+    # so each read only sees data written since the previous one
+
+    def __init__(self, path, max_bytes=8 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.offset = 0
+        self.malformed = 0
+        self._partial = b''
+
+    def read(self):
+        if not os.path.exists(self.path):
+            return []
+        if os.path.getsize(self.path) < self.offset:
+            # The file was truncated or rotated: start again from the top
+            self.offset = 0
+            self._partial = b''
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            chunk = f.read(self.max_bytes)
+        self.offset += len(chunk)
+
+        lines = (self._partial + chunk).split(b'\n')
+        self._partial = lines.pop()  # Incomplete last line, finished by a later write
+        records = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            if isinstance(record, dict):
+                records.append(record)
+            else:
+                # Not JSON, or JSON that is not an object (e.g. a bare number or list)
+                self.malformed += 1
+        return records
+
+
+class QueueSource:
+    # In-process stand-in for a socket or message queue: producers put record dicts on `queue`
+
+    def __init__(self, record_queue=None, max_records=100_000):
+        self.queue = record_queue if record_queue is not None else queue.Queue()
+        self.max_records = max_records
+
+    def read(self):
+        records = []
+        while len(records) < self.max_records:
+            try:
+                records.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return records
+
+
+class RollingAggregator:
+    # Per-plant, per-period running totals of FIELDS, keeping only the latest `max_periods` periods
+
+    def __init__(self, max_periods=12):
+        self.max_periods = max_periods
+        self.totals = {}  # plant -> OrderedDict(period -> array of FIELDS totals followed by the record count)
+        self._lock = threading.Lock()  # fold() may run in one session while others read
+
+    def fold(self, records):
+        # Add a batch of records to the running totals in one grouped pass
+        if not records:
+            return
+        frame = pd.DataFrame.from_records(records, columns=['plant', 'timestamp'] + FIELDS)
+        frame[FIELDS] = frame[FIELDS].apply(pd.to_numeric, errors='coerce').fillna(0.0)
+        frame['plant'] = frame['plant'].fillna('Unknown Plant').astype(str)
+        frame['period'] = frame['timestamp'].astype(str).str[:7]
+        frame['records'] = 1
+        grouped = frame.groupby(['plant', 'period'], sort=True)[FIELDS + ['records']].sum()
+
+        with self._lock:
+            for (plant, period), values in zip(grouped.index, grouped.to_numpy(dtype=np.float64)):
+                periods = self.totals.setdefault(plant, OrderedDict())
+                if period in periods:
+                    periods[period] += values
+                else:
+                    periods[period] = values.copy()
+            for periods in self.totals.values():
+                while len(periods) > self.max_periods:
+                    del periods[min(periods)]
+
+    def plants(self):
+        with self._lock:
+            return sorted(self.totals)
+
+    def series(self, plant):
+        # Totals for one plant as a DataFrame indexed by period, oldest first
+        with self._lock:
+            periods = self.totals.get(plant, {})
+            keys = sorted(periods)
+            rows = [periods[key].copy() for key in keys]
+        if not rows:
+            return pd.DataFrame(columns=FIELDS + ['records'])
+        return pd.DataFrame(rows, index=pd.Index(keys, name='period'), columns=FIELDS + ['records'])
+
+
+class TelemetryIngestor:
+    # Drains a source into a RollingAggregator; poll() is cheap to call from every refresh
+
+    def __init__(self, source, aggregator=None, max_batches_per_poll=50):
+        self.source = source
+        self.aggregator = aggregator if aggregator is not None else RollingAggregator()
+        self.max_batches_per_poll = max_batches_per_poll
+        self.records_ingested = 0
+        self._lock = threading.Lock()
+
+    def poll(self):
+        # Fold everything that arrived since the last poll; returns the number of new records
+        with self._lock:
+            ingested = 0
+            for _ in range(self.max_batches_per_poll):
+                records = self.source.read()
+                if not records:
+                    break
+                self.aggregator.fold(records)
+                ingested += len(records)
+            self.records_ingested += ingested
+            return ingested
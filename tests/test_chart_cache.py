@@ -0,0 +1,38 @@
+from chart_cache import ChartCache
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def draw_line(ax, values):
+    ax.plot(values)
+
+
+def draw_bars(ax, values):
+    ax.bar(range(len(values)), values)
+
+
+def test_same_data_is_rendered_once():
+    cache = ChartCache()
+    first = cache.render(draw_line, (1, 2, 3))
+    again = cache.render(draw_line, (1, 2, 3))
+    assert first.startswith(PNG_SIGNATURE)
+    assert again is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_key_includes_drawing_function_and_data():
+    cache = ChartCache()
+    cache.render(draw_line, (1, 2, 3))
+    cache.render(draw_bars, (1, 2, 3))
+    cache.render(draw_line, (1, 2, 4))
+    assert cache.misses == 3
+
+
+def test_figure_is_cleared_and_entries_bounded():
+    cache = ChartCache(max_entries=2)
+    for number in range(4):
+        cache.render(draw_line, (number, number + 1))
+        assert not cache._figure.axes
+    assert len(cache._images) == 2
+    cache.render(draw_line, (0, 1))
+    assert cache.misses == 5
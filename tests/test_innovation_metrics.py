@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from innovation_metrics import (CONDITION_COLUMNS, INPUT_COLUMNS, METRIC_COLUMNS, format_critical_conditions,
+                                score_arrays, score_frame)
+
+
+def inputs(**overrides):
+    row = {
+        'Pre-Innovation Market Share': 10.0,
+        'Post-Innovation Market Share': 12.0,
+        'Sales Before Innovation': 1000.0,
+        'Sales After Innovation': 1500.0,
+        'Gross Profit Before Innovation': 300.0,
+        'Gross Profit After Innovation': 400.0,
+        'Net Profit Before Innovation': 100.0,
+        'Net Profit After Innovation': 150.0,
+        'Cost of Goods Sold': 600.0,
+        'Beginning Inventory': 100.0,
+        'Ending Inventory': 200.0,
+        'Net Operating Profit After Taxes': 80.0,
+        'Invested Capital (Market Value)': 400.0,
+        'Incremental Costs': 100.0,
+        'Incremental Capital Expenditure': 150.0,
+    }
+    row.update(overrides)
+    return row
+
+
+def test_metrics_of_one_idea():
+    scored = score_frame(pd.DataFrame([inputs()]))
+    row = scored.iloc[0]
+    assert row['Incremental Market Share Gain (%)'] == pytest.approx(20.0)
+    assert row['Contribution to Sales (%)'] == pytest.approx(50.0)
+    assert row['Contribution to Gross Margin (%)'] == pytest.approx(20.0)
+    assert row['Contribution to Net Profit Margin (%)'] == pytest.approx(10.0)
+    assert row['Inventory Velocity (Times per year)'] == pytest.approx(4.0)
+    assert row['ROIC (%)'] == pytest.approx(20.0)
+    assert row['Cash Generation (in $)'] == pytest.approx(250.0)
+    assert row[CONDITION_COLUMNS].all() and row['Conditions Met']
+    assert not row[[f"{name} Invalid" for name in METRIC_COLUMNS]].any()
+
+
+def test_division_by_zero_is_masked_not_raised():
+    frame = pd.DataFrame([
+        inputs(**{'Pre-Innovation Market Share': 0.0}),
+        inputs(**{'Sales After Innovation': 1000.0, 'Incremental Costs': 0.0, 'Incremental Capital Expenditure': 0.0}),
+        inputs(**{'Invested Capital (Market Value)': 0.0}),
+    ])
+    scored = score_frame(frame)
+
+    assert scored['Incremental Market Share Gain (%) Invalid'].tolist() == [True, False, False]
+    # No sales change: both margin contributions divide by zero
+    assert scored['Contribution to Gross Margin (%) Invalid'].tolist() == [False, True, False]
+    assert scored['Contribution to Net Profit Margin (%) Invalid'].tolist() == [False, True, False]
+    assert scored['ROIC (%) Invalid'].tolist() == [False, False, True]
+    assert np.isnan(scored.loc[2, 'ROIC (%)'])
+    # An invalid metric never satisfies its condition
+    assert scored['Market Share Gain > 0'].tolist() == [False, True, True]
+    assert scored['ROIC > WACC'].tolist() == [True, True, False]
+    assert scored['Cash Generation > 0'].tolist() == [True, False, True]
+    assert not scored['Conditions Met'].any()
+
+
+def test_wacc_threshold_and_non_numeric_inputs():
+    frame = pd.DataFrame([inputs(), inputs(**{'Sales Before Innovation': 'n/a'})], index=['a', 'b'])
+    scored = score_frame(frame, wacc=25.0)
+    assert list(scored.index) == ['a', 'b']
+    assert not scored.loc['a', 'ROIC > WACC']
+    assert scored.loc['b', 'Contribution to Sales (%) Invalid']
+
+
+def test_missing_input_columns_raise():
+    with pytest.raises(KeyError, match='Sales After Innovation'):
+        score_frame(pd.DataFrame([inputs()]).drop(columns=['Sales After Innovation']))
+
+
+def test_score_arrays_broadcasts_samples():
+    base = {name: np.array([[value]]) for name, value in inputs().items()}
+    base['Sales After Innovation'] = np.array([[1500.0, 2000.0, 2500.0]])
+    metrics, invalid, _ = score_arrays(base)
+    assert metrics['Cash Generation (in $)'].shape == (1, 3)
+    assert metrics['Cash Generation (in $)'].tolist() == [[250.0, 750.0, 1250.0]]
+    assert not invalid['Cash Generation (in $)'].any()
+
+
+def test_critical_conditions_text():
+    scored = score_frame(pd.DataFrame([inputs(), inputs(**{'Invested Capital (Market Value)': 0.0})]))
+    text = format_critical_conditions(scored)
+    assert 'Current gain: 20.00%' in text[0]
+    assert 'Current ROIC: 20.00%' in text[0]
+    assert 'Cash generation should be positive: $250.00' in text[0]
+    assert 'Current ROIC: n/a' in text[1]
+
+
+def test_inputs_cover_every_column():
+    assert set(inputs()) == set(INPUT_COLUMNS)
@@ -0,0 +1,88 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from innovation_schema import (COLUMNS, DEFAULT_RECORD, SCHEMA, apply_schema, coerce_value, empty_frame, to_arrow,
+                               validate_records)
+from innovation_store import InnovationStore
+from persistence import DataStore
+
+
+def test_empty_frame_has_declared_dtypes():
+    frame = empty_frame()
+    assert list(frame.columns) == COLUMNS
+    for column, dtype in SCHEMA.items():
+        assert frame[column].dtype == dtype
+    assert frame['Value 1'].dtype == object
+
+
+def test_apply_schema_normalises_category_spelling():
+    frame = apply_schema(pd.DataFrame({
+        'Sales Team Availability': ['yes', ' NO', 'Yes'],
+        'Technology Type': ['sustaining', 'Disruptive ', 'DISRUPTIVE'],
+        'Status': ['approved', 'Under evaluation', 'Rejected'],
+    }))
+    assert frame['Sales Team Availability'].tolist() == ['Yes', 'No', 'Yes']
+    assert frame['Technology Type'].tolist() == ['Sustaining', 'Disruptive', 'Disruptive']
+    assert frame['Status'].tolist() == ['Approved', 'Under Evaluation', 'Rejected']
+
+
+def test_validate_records_rejects_unknown_values_and_keeps_blanks():
+    with pytest.raises(ValueError, match='Status: Shelved'):
+        validate_records(pd.DataFrame({'Status': ['Approved', 'Shelved']}))
+    frame = validate_records(pd.DataFrame({'Status': ['approved', ''], 'Technology Type': [None, 'sustaining']}))
+    assert frame['Status'].tolist()[0] == 'Approved' and pd.isna(frame['Status'].tolist()[1])
+    assert frame['Technology Type'].tolist()[1] == 'Sustaining'
+
+
+def test_coerce_value():
+    assert coerce_value('ROIC (%)', 1.25) == np.float32(1.25)
+    assert coerce_value('Status', 'approved') == 'Approved'
+    assert coerce_value('Conditions Met', np.True_) is True
+    with pytest.raises(ValueError):
+        coerce_value('Technology Type', 'Incremental')
+
+
+def test_store_keeps_typed_columns_through_updates():
+    store = InnovationStore()
+    idea = store.add({'Status': 'approved', 'Sales After Innovation': 10})
+    store.update(idea, {'Status': 'rejected', 'ROIC (%)': 1.5, 'Conditions Met': True})
+    assert store.get(idea)['Status'] == 'Rejected'
+    assert store.filter({'Status': ['Rejected']}) == [idea]
+    assert store.values('Status') == ['Rejected']
+    assert isinstance(store.frame['Status'].dtype, pd.CategoricalDtype)
+    assert store.frame['ROIC (%)'].dtype == np.float32
+
+
+def test_store_rejects_unknown_category_without_touching_indexes():
+    store = InnovationStore()
+    idea = store.add({'Status': 'Approved'})
+    with pytest.raises(ValueError):
+        store.update(idea, {'Status': 'Shelved'})
+    assert store.filter({'Status': ['Approved']}) == [idea]
+
+
+def test_import_rejects_unknown_values_before_writing(tmp_path):
+    db = DataStore(str(tmp_path / 'app.db'))
+    try:
+        buffer = io.StringIO(pd.DataFrame([{**DEFAULT_RECORD, 'Status': 'Shelved'}], index=['Innovation 1']).to_csv())
+        with pytest.raises(ValueError):
+            db.import_table('innovation_inputs', buffer, prepare=validate_records)
+        assert db.count('innovation_inputs') == 0
+
+        buffer = io.StringIO(pd.DataFrame([{**DEFAULT_RECORD, 'Status': 'approved'}], index=['Innovation 1']).to_csv())
+        assert db.import_table('innovation_inputs', buffer, prepare=validate_records) == 1
+        assert db.latest('innovation_inputs')['Innovation 1']['Status'] == 'Approved'
+    finally:
+        db.close()
+
+
+def test_to_arrow_dictionary_encodes_categoricals():
+    pa = pytest.importorskip('pyarrow')
+    store = InnovationStore()
+    store.add({'Status': 'Approved'})
+    table = to_arrow(store.frame)
+    assert pa.types.is_dictionary(table.schema.field('Status').type)
+    assert table.schema.field('Sales After Innovation').type == pa.float64()
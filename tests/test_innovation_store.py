@@ -0,0 +1,77 @@
+import pandas as pd
+import pytest
+
+from innovation_schema import DEFAULT_RECORD
+from innovation_store import InnovationStore, page, page_count
+
+
+@pytest.fixture
+def store():
+    store = InnovationStore()
+    store.add_many({
+        'Innovation 1': {'Plant': 'North', 'Status': 'Approved'},
+        'Innovation 2': {'Plant': 'South', 'Status': 'Approved', 'Technology Type': 'Disruptive'},
+        'Innovation 3': {'Plant': 'North', 'Status': 'Rejected'},
+    })
+    return store
+
+
+def test_add_assigns_the_next_free_id(store):
+    assert store.add() == 'Innovation 4'
+    assert store.get('Innovation 4') == {**DEFAULT_RECORD}
+    with pytest.raises(KeyError):
+        store.add(idea_id='Innovation 1')
+    with pytest.raises(KeyError):
+        store.add_many({'Innovation 2': {}})
+
+
+def test_filter_intersects_indexes_in_insertion_order(store):
+    assert store.filter({'Plant': ['North']}) == ['Innovation 1', 'Innovation 3']
+    assert store.filter({'Plant': ['North', 'South'], 'Status': ['Approved']}) == ['Innovation 1', 'Innovation 2']
+    assert store.filter({'Technology Type': ['Disruptive'], 'Status': ['Rejected']}) == []
+    assert store.filter({'Plant': []}) == store.ids()
+
+
+def test_update_moves_idea_between_index_values(store):
+    store.update('Innovation 1', {'Plant': 'South', 'Sales After Innovation': 5.0, 'Unknown': 1})
+    assert store.filter({'Plant': ['South']}) == ['Innovation 1', 'Innovation 2']
+    assert store.get('Innovation 1')['Sales After Innovation'] == 5.0
+    assert 'Unknown' not in store.frame.columns
+    with pytest.raises(KeyError):
+        store.update('Innovation 9', {'Plant': 'East'})
+
+
+def test_remove_and_values(store):
+    store.remove('Innovation 2')
+    assert 'Innovation 2' not in store
+    assert len(store) == 2
+    assert store.values('Plant') == ['North']
+    assert list(store.rows(['Innovation 3', 'Innovation 1']).index) == ['Innovation 3', 'Innovation 1']
+
+
+def test_paging():
+    items = list(range(60))
+    assert page_count(0, 25) == 1
+    assert page_count(60, 25) == 3
+    assert page(items, 3, 25) == list(range(50, 60))
+    assert page(items, 4, 25) == []
+
+
+def test_diff_of_unchanged_values_is_empty(store):
+    assert store.diff('Innovation 1', store.get('Innovation 1')) == {}
+
+
+def test_diff_of_one_edit(store):
+    values = store.get('Innovation 2')
+    values['Sales After Innovation'] = 1500.0
+    assert store.diff('Innovation 2', values) == {'Sales After Innovation': 1500.0}
+
+
+def test_diff_treats_missing_values_as_equal(store):
+    store.update('Innovation 1', {'Technology Type': None})
+    values = store.get('Innovation 1')
+    assert pd.isna(values['Technology Type'])
+    values['Technology Type'] = None
+    assert store.diff('Innovation 1', values) == {}
+    values['Technology Type'] = 'Sustaining'
+    assert store.diff('Innovation 1', values) == {'Technology Type': 'Sustaining'}
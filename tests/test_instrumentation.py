@@ -0,0 +1,51 @@
+import threading
+
+from instrumentation import BUCKETS, MetricsRegistry, RerunTimer, span
+
+
+def test_session_overflow_folds_into_other():
+    registry = MetricsRegistry(max_sessions=3)
+    for session in ['a', 'b', 'c', 'd', 'e']:
+        registry.count_rerun('innovation', session)
+    registry.count_rerun('innovation', 'e')
+
+    text = registry.render()
+    assert 'app_reruns_total{app="innovation"} 6' in text
+    assert 'app_session_reruns_total{app="innovation",session="other"} 2' in text
+    assert 'app_session_reruns_total{app="innovation",session="e"} 2' in text
+    assert 'session="a"' not in text and 'session="b"' not in text
+
+
+def test_session_overflow_does_not_block():
+    registry = MetricsRegistry(max_sessions=3)
+    worker = threading.Thread(target=lambda: [registry.count_rerun('plant', str(n)) for n in range(1000)], daemon=True)
+    worker.start()
+    worker.join(timeout=5)
+    assert not worker.is_alive()
+    assert 'app_session_reruns_total{app="plant",session="other"} 997' in registry.render()
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    registry.observe('plant', 'charts', 0.003)
+    registry.observe('plant', 'charts', 20.0)
+
+    text = registry.render()
+    assert 'app_section_seconds_bucket{app="plant",section="charts",le="0.001"} 0' in text
+    assert 'app_section_seconds_bucket{app="plant",section="charts",le="0.005"} 1' in text
+    assert f'app_section_seconds_bucket{{app="plant",section="charts",le="{BUCKETS[-1]:g}"}} 1' in text
+    assert 'app_section_seconds_bucket{app="plant",section="charts",le="+Inf"} 2' in text
+    assert 'app_section_seconds_count{app="plant",section="charts"} 2' in text
+
+
+def test_span_and_rerun_timer_record_sections():
+    registry = MetricsRegistry()
+    with span('innovation', 'load', registry):
+        pass
+    timer = RerunTimer('innovation', 'session', registry)
+    timer.mark('selector')
+    timer.finish()
+
+    text = registry.render()
+    for section in ('load', 'selector', 'total'):
+        assert f'app_section_seconds_count{{app="innovation",section="{section}"}} 1' in text
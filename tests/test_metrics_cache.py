@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+from innovation_metrics import INPUT_COLUMNS, score_frame
+from metrics_cache import MetricsCache, input_hash
+
+
+def frame(*sales_after, index=None):
+    rows = [{**{name: 100.0 for name in INPUT_COLUMNS}, 'Sales After Innovation': value} for value in sales_after]
+    return pd.DataFrame(rows, index=index)
+
+
+def test_hits_and_misses_are_counted():
+    cache = MetricsCache()
+    cache.score(frame(200.0, 300.0))
+    cache.score(frame(300.0, 400.0))
+    assert cache.stats() == {'hits': 1, 'misses': 3, 'entries': 3, 'max_entries': 100_000}
+
+
+def test_cached_result_matches_direct_scoring():
+    cache = MetricsCache()
+    ideas = frame(200.0, 300.0, 100.0, index=['a', 'b', 'c'])
+    cache.score(ideas.iloc[[1]])
+    result = cache.score(ideas)
+    pd.testing.assert_frame_equal(result, score_frame(ideas), check_dtype=False)
+    assert list(result.index) == ['a', 'b', 'c']
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = MetricsCache(max_entries=2)
+    cache.score(frame(1.0))
+    cache.score(frame(2.0))
+    cache.score(frame(1.0))  # 1.0 is now the most recently used
+    cache.score(frame(3.0))  # evicts 2.0
+    assert len(cache) == 2
+    misses = cache.misses
+    cache.score(frame(1.0, 3.0))
+    assert cache.misses == misses
+    cache.score(frame(2.0))
+    assert cache.misses == misses + 1
+
+
+def test_invalidate_and_clear():
+    cache = MetricsCache()
+    ideas = frame(200.0)
+    cache.score(ideas)
+    cache.invalidate(ideas[INPUT_COLUMNS].to_numpy()[0])
+    assert len(cache) == 0
+    cache.score(ideas)
+    cache.clear()
+    assert len(cache) == 0 and cache.misses == 2
+
+
+def test_input_hash_depends_on_content_only():
+    values = np.arange(len(INPUT_COLUMNS), dtype=np.float64)
+    assert input_hash(values) == input_hash(list(values))
+    assert input_hash(values) != input_hash(values + 1)
+
+
+def test_empty_frame():
+    result = MetricsCache().score(pd.DataFrame(columns=INPUT_COLUMNS))
+    assert result.empty and 'ROIC (%)' in result.columns
@@ -0,0 +1,81 @@
+import io
+import threading
+from datetime import date
+
+import numpy as np
+import pytest
+
+from persistence import DataStore
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DataStore(str(tmp_path / 'app.db'))
+    yield db
+    db.close()
+
+
+def test_latest_version_per_key_in_first_insertion_order(db):
+    db.append('innovation_inputs', 'Innovation 2', {'Status': 'Proposed'})
+    db.append('innovation_inputs', 'Innovation 1', {'Status': 'Proposed'})
+    db.append('innovation_inputs', 'Innovation 2', {'Status': 'Approved'})
+
+    latest = db.latest('innovation_inputs')
+    assert list(latest) == ['Innovation 2', 'Innovation 1']
+    assert latest['Innovation 2'] == {'Status': 'Approved'}
+    assert db.count('innovation_inputs') == 2
+    assert db.latest('innovation_metrics') == {}
+
+
+def test_records_survive_reopening(tmp_path):
+    path = str(tmp_path / 'app.db')
+    first = DataStore(path)
+    first.append_many('action_items', [(1, {'Due Date': date(2024, 5, 3), 'Benefit': np.float64(2.5)})])
+    first.close()
+
+    second = DataStore(path)
+    try:
+        assert second.latest('action_items') == {'1': {'Due Date': '2024-05-03', 'Benefit': 2.5}}
+    finally:
+        second.close()
+
+
+def test_load_frame_is_indexed_by_key(db):
+    db.append_many('productivity_improvements', [('a', {'Status': 'Open'}), ('b', {'Status': 'Completed'})])
+    frame = db.load_frame('productivity_improvements')
+    assert frame.index.name == 'entry_id'
+    assert frame.loc['b', 'Status'] == 'Completed'
+
+
+@pytest.mark.parametrize('file_format', ['csv', 'parquet'])
+def test_export_import_round_trip(db, tmp_path, file_format):
+    if file_format == 'parquet':
+        pytest.importorskip('pyarrow')
+    records = {'Innovation 1': {'Plant': 'North', 'Sales After Innovation': 10.5},
+               'Innovation 2': {'Plant': 'South', 'Sales After Innovation': 0.0}}
+    db.append_many('innovation_inputs', records.items())
+    buffer = io.BytesIO() if file_format == 'parquet' else io.StringIO()
+    db.export_table('innovation_inputs', buffer, file_format=file_format)
+    buffer.seek(0)
+
+    other = DataStore(str(tmp_path / 'other.db'))
+    try:
+        assert other.import_table('innovation_inputs', buffer, file_format=file_format) == 2
+        assert other.latest('innovation_inputs') == records
+    finally:
+        other.close()
+
+
+def test_concurrent_appends(db):
+    def writer(number):
+        for version in range(20):
+            db.append('innovation_inputs', f"Innovation {number}", {'Version': version})
+
+    threads = [threading.Thread(target=writer, args=(number,)) for number in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    latest = db.latest('innovation_inputs')
+    assert len(latest) == 8
+    assert all(record == {'Version': 19} for record in latest.values())
@@ -0,0 +1,144 @@
+import pandas as pd
+import pytest
+
+from innovation_schema import DEFAULT_RECORD
+from plant_rollup import EMPTY_PRODUCTION, AggregationEngine, PlantHierarchy, plant_metrics
+
+PRODUCTION = pd.DataFrame({
+    'Metric': ['Production Output', 'Production Costs'],
+    'Target': [100.0, 50.0],
+    'Actual': [90.0, 55.0],
+    'Status': ['Delayed', 'Issue'],
+})
+
+
+def innovations(count, **values):
+    return pd.DataFrame([{**DEFAULT_RECORD, 'Net Operating Profit After Taxes': 10.0,
+                          'Invested Capital (Market Value)': 100.0, **values} for _ in range(count)])
+
+
+@pytest.fixture
+def engine():
+    return AggregationEngine(PlantHierarchy({'Plant A': 'North', 'Plant B': 'North'}))
+
+
+def test_plant_metrics_without_production_data():
+    result = plant_metrics(EMPTY_PRODUCTION, innovations(2))
+    assert 'Production Output Target' not in result
+    assert result['Innovations'] == 2
+    assert result['On Track'] == result['Delayed'] == result['Issue'] == 0
+
+
+def test_organization_totals_sum_plants(engine):
+    engine.update_plant('Plant A', PRODUCTION, innovations(1))
+    engine.update_plant('Plant B', PRODUCTION, innovations(2))
+    engine.refresh()
+
+    north = engine.organization_table().loc['North']
+    assert north['Plants'] == 2
+    assert north['Production Output Target'] == 200
+    assert north['Innovations'] == 3
+    assert north['ROIC (%)'] == pytest.approx(10.0)
+
+
+def test_unchanged_plant_is_not_recomputed(engine):
+    assert engine.update_plant('Plant A', PRODUCTION, innovations(1))
+    engine.refresh()
+    assert not engine.update_plant('Plant A', PRODUCTION, innovations(1))
+    assert engine.refresh() == 0
+
+
+def test_plant_without_production_adds_no_production_figures(engine):
+    engine.update_plant('Plant A', PRODUCTION, innovations(0))
+    engine.update_plant('Plant C', EMPTY_PRODUCTION, innovations(1))
+    engine.refresh()
+
+    assert engine.organization_table().loc['North', 'Production Output Target'] == 100
+    assert engine.organization_table().loc['Organization', 'Innovations'] == 1
+    assert pd.isna(engine.plant_table().loc['Plant C', 'Production Output Target'])
+
+
+def test_organization_level_innovations_count_towards_totals(engine):
+    engine.update_plant('Plant A', PRODUCTION, innovations(1))
+    engine.update_organization('North', innovations(4))
+    engine.refresh()
+
+    north = engine.organization_table().loc['North']
+    assert north['Innovations'] == 5
+    assert north['Plants'] == 1
+    assert list(engine.plant_table().index) == ['Plant A']
+
+    engine.remove_organization('North')
+    assert engine.organization_table().loc['North', 'Innovations'] == 1
+
+
+def test_reassigned_plant_moves_to_new_organization(engine):
+    engine.update_plant('Plant A', PRODUCTION, innovations(1))
+    engine.update_plant('Plant B', PRODUCTION, innovations(1))
+    engine.refresh()
+
+    # Reassigned elsewhere (e.g. by another session) while the plant's data is unchanged
+    engine.hierarchy.add('Plant A', 'South')
+    engine.refresh()
+    table = engine.organization_table()
+    assert table.loc['North', 'Plants'] == 1
+    assert table.loc['South', 'Plants'] == 1
+    assert table.loc['South', 'Production Output Target'] == 100
+    assert engine.plant_table().loc['Plant A', 'Organization'] == 'South'
+
+    # A later change to the plant is taken out of South, not North
+    engine.update_plant('Plant A', PRODUCTION, innovations(3))
+    engine.refresh()
+    table = engine.organization_table()
+    assert table.loc['North', 'Innovations'] == 1
+    assert table.loc['South', 'Innovations'] == 3
+
+
+def test_emptied_organization_is_dropped(engine):
+    engine.update_plant('Plant A', PRODUCTION, innovations(1))
+    engine.refresh()
+    engine.hierarchy.add('Plant A', 'South')
+    engine.refresh()
+    assert list(engine.organization_table().index) == ['South']
+
+    engine.remove_plant('Plant A')
+    assert engine.organization_table().empty
+
+
+def test_parallel_refresh_matches_serial():
+    plants = {f"Plant {number}": innovations(number % 3) for number in range(6)}
+    serial = AggregationEngine(parallel_threshold=100)
+    parallel = AggregationEngine(parallel_threshold=2, max_workers=2)
+    for engine in (serial, parallel):
+        for plant, ideas in plants.items():
+            engine.update_plant(plant, PRODUCTION, ideas)
+        engine.refresh()
+    pd.testing.assert_frame_equal(serial.organization_table(), parallel.organization_table())
+
+
+def test_innovation_moving_between_plants_is_counted_once(engine):
+    cash = {'Sales After Innovation': 1500.0, 'Sales Before Innovation': 1000.0}
+    engine.update_plant('Plant X', EMPTY_PRODUCTION, innovations(1, **cash))
+    engine.refresh()
+
+    # The innovation's Plant changes to Plant Y: the app re-queues current plants and drops the rest
+    current = ['Plant Y']
+    engine.update_plant('Plant Y', EMPTY_PRODUCTION, innovations(1, **cash))
+    for plant in set(engine.plants()) - set(current):
+        engine.remove_plant(plant)
+    engine.refresh()
+
+    assert engine.plants() == ['Plant Y']
+    organization = engine.organization_table().loc['Organization']
+    assert organization['Plants'] == 1
+    assert organization['Innovations'] == 1
+    assert organization['Cash Generation (in $)'] == 500
+
+
+def test_assign_organizations_moves_plants_on_refresh(engine):
+    engine.update_plant('Plant A', PRODUCTION, innovations(1))
+    engine.refresh()
+    engine.assign_organizations({'Plant A': 'South'})
+    assert 'South' in engine.organizations()
+    engine.refresh()
+    assert list(engine.organization_table().index) == ['South']
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from innovation_metrics import INPUT_COLUMNS
+from innovation_schema import DEFAULT_RECORD
+from portfolio import ALIGNMENT_COLUMNS, monte_carlo, rank_portfolio
+
+
+def portfolio(count):
+    rows = []
+    for number in range(count):
+        row = {**DEFAULT_RECORD, **{name: 100.0 + number for name in INPUT_COLUMNS}}
+        row['Sales After Innovation'] = 200.0 + 50 * number
+        row['Net Operating Profit After Taxes'] = 10.0 * (number + 1)
+        rows.append(row)
+    return pd.DataFrame(rows, index=[f"Innovation {number + 1}" for number in range(count)])
+
+
+def test_rank_portfolio_orders_by_composite_score():
+    frame = portfolio(4)
+    frame.loc['Innovation 1', ALIGNMENT_COLUMNS] = 'Yes'
+    ranking = rank_portfolio(frame)
+    assert ranking['Rank'].tolist() == [1, 2, 3, 4]
+    assert ranking['Composite Score'].is_monotonic_decreasing
+    assert ranking.loc['Innovation 1', 'Alignment Score'] == 100
+    assert ranking.index[0] == 'Innovation 4'
+
+
+def test_uncomputable_metrics_rank_last():
+    frame = portfolio(3)
+    frame.loc['Innovation 3', 'Invested Capital (Market Value)'] = 0.0
+    ranking = rank_portfolio(frame)
+    assert np.isnan(ranking.loc['Innovation 3', 'ROIC (%)'])
+
+
+def test_monte_carlo_bands_are_ordered_and_reproducible():
+    frame = portfolio(5)
+    bands = monte_carlo(frame, samples=2_000, seed=7)
+    again = monte_carlo(frame, samples=2_000, seed=7)
+    pd.testing.assert_frame_equal(bands, again)
+    column = 'Cash Generation (in $)'
+    assert (bands[f"{column} P5"] <= bands[f"{column} P50"]).all()
+    assert (bands[f"{column} P50"] <= bands[f"{column} P95"]).all()
+    # ROIC does not depend on the varied inputs, so its band collapses to the base value
+    assert (bands['ROIC (%) P5'] == bands['ROIC (%) P95']).all()
+
+
+def test_monte_carlo_parallel_matches_serial():
+    frame = portfolio(6)
+    serial = monte_carlo(frame, samples=1_000, seed=3, max_workers=1, chunk_elements=2_000)
+    parallel = monte_carlo(frame, samples=1_000, seed=3, max_workers=2, chunk_elements=2_000)
+    pd.testing.assert_frame_equal(serial, parallel)
+
+
+def test_monte_carlo_rejects_empty_sample():
+    with pytest.raises(ValueError):
+        monte_carlo(portfolio(2), samples=0)
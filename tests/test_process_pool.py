@@ -0,0 +1,8 @@
+from process_pool import shared_executor
+
+
+def test_executor_is_reused_per_worker_count():
+    executor = shared_executor(2)
+    assert shared_executor(2) is executor
+    assert shared_executor(1) is not executor
+    assert list(executor.map(abs, [-1, -2])) == [1, 2]
@@ -0,0 +1,99 @@
+import pandas as pd
+import pytest
+
+from innovation_metrics import INPUT_COLUMNS
+from score_innovations import main, score_file
+
+
+@pytest.fixture
+def inputs_csv(tmp_path):
+    # Six rows whose pass-through columns change inferred type between chunks of three:
+    # 'Notes' is blank in the first chunk, 'Batch' is an integer column with a later blank
+    frame = pd.DataFrame({name: [100.0 + row for row in range(6)] for name in INPUT_COLUMNS})
+    frame.insert(0, 'Name', [f"Idea {row}" for row in range(6)])
+    frame['Notes'] = ['', '', '', 'late note', '', 'another']
+    frame['Batch'] = ['1', '2', '3', '4', '', '6']
+    path = tmp_path / 'inputs.csv'
+    frame.to_csv(path, index=False)
+    return path
+
+
+def test_parquet_output_across_chunks(inputs_csv, tmp_path):
+    output = tmp_path / 'scored.parquet'
+    assert main([str(inputs_csv), str(output), '--chunk-size', '3']) == 0
+
+    scored = pd.read_parquet(output)
+    assert len(scored) == 6
+    assert scored['Notes'].tolist()[3] == 'late note'
+    assert scored['Name'].tolist() == [f"Idea {row}" for row in range(6)]
+    assert scored['ROIC (%)'].notna().all()
+
+
+@pytest.mark.parametrize('extension', ['csv', 'jsonl'])
+def test_text_outputs_across_chunks(inputs_csv, tmp_path, extension):
+    output = tmp_path / f"scored.{extension}"
+    assert score_file(str(inputs_csv), str(output), chunk_size=4, conditions_text=True) == 6
+
+    if extension == 'csv':
+        scored = pd.read_csv(output)
+    else:
+        assert '\n\n' not in output.read_text()
+        scored = pd.read_json(output, lines=True)
+    assert len(scored) == 6
+    assert scored['Critical Conditions'].str.contains('ROIC').all()
+
+
+def test_metrics_only_drops_inputs(inputs_csv, tmp_path):
+    output = tmp_path / 'scored.csv'
+    score_file(str(inputs_csv), str(output), metrics_only=True)
+    assert 'Name' not in pd.read_csv(output).columns
+
+
+def test_missing_input_columns_fail(tmp_path, capsys):
+    path = tmp_path / 'bad.csv'
+    pd.DataFrame({'Name': ['x']}).to_csv(path, index=False)
+    assert main([str(path), str(tmp_path / 'out.csv')]) == 1
+    assert 'Missing input columns' in capsys.readouterr().err
+
+
+@pytest.fixture
+def inputs_jsonl(tmp_path):
+    # 'Owner' only appears in some records; 'Notes' only from the third record on
+    records = pd.DataFrame({name: [100.0 + row for row in range(4)] for name in INPUT_COLUMNS})
+    records.insert(0, 'Name', [f"Idea {row}" for row in range(4)])
+    lines = records.to_json(orient='records', lines=True).splitlines()
+    lines[0] = lines[0][:-1] + ', "Owner": "Ann"}'
+    lines[2] = lines[2][:-1] + ', "Notes": "late key"}'
+    path = tmp_path / 'inputs.jsonl'
+    path.write_text('\n'.join(lines) + '\n')
+    return path
+
+
+@pytest.mark.parametrize('extension', ['csv', 'jsonl', 'parquet'])
+def test_key_first_seen_in_a_later_chunk_fails_clearly(inputs_jsonl, tmp_path, capsys, extension):
+    assert main([str(inputs_jsonl), str(tmp_path / f"scored.{extension}"), '--chunk-size', '2']) == 1
+    assert 'Notes' in capsys.readouterr().err
+
+
+def test_keys_missing_from_later_chunks_are_blank(inputs_jsonl, tmp_path):
+    output = tmp_path / 'scored.csv'
+    assert main([str(inputs_jsonl), str(output), '--chunk-size', '4']) == 0
+    scored = pd.read_csv(output)
+    assert len(scored) == 4
+    assert scored['Owner'].tolist()[0] == 'Ann' and scored['Owner'].isna().sum() == 3
+
+
+def test_later_chunk_without_optional_key(tmp_path):
+    records = pd.DataFrame({name: [1.0, 2.0, 3.0] for name in INPUT_COLUMNS})
+    records['Owner'] = ['Ann', None, None]
+    path = tmp_path / 'inputs.jsonl'
+    lines = records.to_json(orient='records', lines=True).splitlines()
+    lines[1] = lines[1].replace(',"Owner":null', '')
+    lines[2] = lines[2].replace(',"Owner":null', '')
+    path.write_text('\n'.join(lines) + '\n')
+
+    output = tmp_path / 'scored.jsonl'
+    assert main([str(path), str(output), '--chunk-size', '1']) == 0
+    scored = pd.read_json(output, lines=True)
+    assert len(scored) == 3
+    assert scored['Owner'].tolist()[0] == 'Ann' and scored['Owner'].isna().sum() == 2
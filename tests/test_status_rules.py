@@ -0,0 +1,49 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from status_rules import anomalies, classify, classify_frame, overdue_mask, shortfall
+
+
+def test_shortfall_respects_direction():
+    assert shortfall([100], [90], True).tolist() == [0.1]
+    assert shortfall([100], [90], False).tolist() == [-0.1]
+    assert shortfall([0], [2], False).tolist() == [2.0]
+
+
+def test_classify_thresholds():
+    statuses = classify([100, 100, 100, 100], [120, 100, 95, 80], np.array([True] * 4))
+    assert statuses.tolist() == ['On Track', 'On Track', 'Delayed', 'Issue']
+
+
+def test_classify_frame_uses_metric_directions():
+    frame = pd.DataFrame({
+        'Metric': ['Production Output', 'Production Costs', 'Safety Incidents', 'Unlisted Metric'],
+        'Target': [100, 100, 0, 10],
+        'Actual': [95, 95, 1, 12],
+    })
+    assert classify_frame(frame).tolist() == ['Delayed', 'On Track', 'Issue', 'On Track']
+
+
+def test_anomalies_flags_outliers():
+    values = [10, 11, 10, 11, 10, 11, 50]
+    series = pd.DataFrame({'output': values, 'costs': [5] * 7},
+                          index=[f"2024-{month:02d}" for month in range(1, 8)])
+    flagged = anomalies(series)
+    assert flagged[['Period', 'Field', 'Value']].values.tolist() == [['2024-07', 'output', 50]]
+    assert anomalies(series.iloc[:6]).empty
+
+
+def test_change_after_flat_history_is_flagged():
+    series = pd.DataFrame({'safety_incidents': [0, 0, 0, 0, 0, 0, 4]},
+                          index=[f"2024-{month:02d}" for month in range(1, 8)])
+    flagged = anomalies(series)
+    assert flagged[['Period', 'Field', 'Value']].values.tolist() == [['2024-07', 'safety_incidents', 4]]
+    assert flagged['Z-Score'].tolist() == [np.inf]
+
+
+def test_overdue_mask():
+    mask = overdue_mask(['2024-05-01', '2024-05-10', '2024-04-01', None],
+                        ['Open', 'Open', 'Completed', 'Open'], today=date(2024, 5, 1))
+    assert mask.tolist() == [True, False, False, False]
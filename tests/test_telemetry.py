@@ -0,0 +1,98 @@
+import json
+import threading
+
+from telemetry import FIELDS, FileTailSource, QueueSource, RollingAggregator, TelemetryIngestor
+
+
+def record(plant, timestamp, **values):
+    return {'plant': plant, 'timestamp': timestamp, **values}
+
+
+def test_aggregator_sums_per_plant_and_period():
+    aggregator = RollingAggregator()
+    aggregator.fold([record('A', '2024-05-03T10:00:00', output=2, costs=1.5),
+                     record('A', '2024-05-20T10:00:00', output=3),
+                     record('A', '2024-06-01T00:00:00', output='bad'),
+                     record('B', '2024-05-01T00:00:00', energy=4)])
+    aggregator.fold([record('A', '2024-05-31T23:59:59', output=5)])
+
+    series = aggregator.series('A')
+    assert list(series.index) == ['2024-05', '2024-06']
+    assert series.loc['2024-05', 'output'] == 10
+    assert series.loc['2024-05', 'costs'] == 1.5
+    assert series.loc['2024-05', 'records'] == 3
+    assert series.loc['2024-06', 'output'] == 0
+    assert aggregator.plants() == ['A', 'B']
+    assert aggregator.series('C').empty
+    assert list(aggregator.series('C').columns) == FIELDS + ['records']
+
+
+def test_aggregator_keeps_latest_periods():
+    aggregator = RollingAggregator(max_periods=2)
+    aggregator.fold([record('A', f"2024-0{month}-01", output=month) for month in range(1, 6)])
+    assert list(aggregator.series('A').index) == ['2024-04', '2024-05']
+
+
+def test_file_tail_reads_only_new_complete_lines(tmp_path):
+    path = tmp_path / 'telemetry.jsonl'
+    source = FileTailSource(str(path))
+    assert source.read() == []
+
+    with open(path, 'w') as f:
+        f.write(json.dumps(record('A', '2024-05-01', output=1)) + '\n')
+        f.write('not json\n')
+        f.write('{"plant": "A", "timestamp": "2024-05-02", ')
+    assert [r['output'] for r in source.read()] == [1]
+    assert source.malformed == 1
+
+    with open(path, 'a') as f:
+        f.write('"output": 2}\n')
+    assert [r['output'] for r in source.read()] == [2]
+    assert source.read() == []
+
+    # Truncated or rotated: read again from the top
+    with open(path, 'w') as f:
+        f.write(json.dumps(record('A', '2024-05-03', output=3)) + '\n')
+    assert [r['output'] for r in source.read()] == [3]
+
+
+def test_ingestor_drains_queue():
+    source = QueueSource(max_records=2)
+    for number in range(5):
+        source.queue.put(record('A', '2024-05-01', output=number))
+    ingestor = TelemetryIngestor(source)
+    assert ingestor.poll() == 5
+    assert ingestor.poll() == 0
+    assert ingestor.records_ingested == 5
+    assert ingestor.aggregator.series('A').loc['2024-05', 'output'] == 10
+
+
+def test_json_that_is_not_an_object_is_malformed(tmp_path):
+    path = tmp_path / 'telemetry.jsonl'
+    path.write_text('\n'.join([json.dumps(record('A', '2024-05-01', output=1)), '5', '[1, 2]',
+                               json.dumps(record('A', '2024-05-02', output=2))]) + '\n')
+    ingestor = TelemetryIngestor(FileTailSource(str(path)))
+    assert ingestor.poll() == 2
+    assert ingestor.source.malformed == 2
+    assert ingestor.aggregator.series('A').loc['2024-05', 'output'] == 3
+
+
+def test_reads_while_folding():
+    aggregator = RollingAggregator(max_periods=3)
+    stop = threading.Event()
+
+    def fold():
+        month = 0
+        while not stop.is_set():
+            month += 1
+            aggregator.fold([record(f"Plant {month % 50}", f"{2000 + month // 12}-{month % 12 + 1:02d}", output=1)])
+
+    worker = threading.Thread(target=fold)
+    worker.start()
+    try:
+        for _ in range(300):
+            for plant in aggregator.plants():
+                aggregator.series(plant)
+    finally:
+        stop.set()
+        worker.join()